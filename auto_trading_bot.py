@@ -3,24 +3,20 @@ Automated Trading Bot - 24x7 Scanner with Auto-Execution
 Continuously scans NIFTY 50, generates signals, and executes trades automatically
 """
 
-import os
 import time
 from datetime import datetime
-from dotenv import load_dotenv
 
 from src.scanner.multi_symbol_scanner import MultiSymbolScanner
 from src.execution.auto_executor import AutoTradeExecutor
 from src.brokers.zerodha_broker import ZerodhaBroker
 from src.risk.risk_manager import RiskManager
+from src.utils.creds import get_creds
 from src.utils.logger import get_logger
 from src.utils.config import config
 from src.utils.market_hours import check_market_hours, get_market_status_detailed
 
 logger = get_logger('auto_trading_bot', config.get('logging'))
 
-# Load environment variables
-load_dotenv()
-
 
 class AutomatedTradingBot:
     """Fully automated trading bot with scanner and executor"""
@@ -39,16 +35,11 @@ class AutomatedTradingBot:
         logger.info("🤖 Initializing Automated Trading Bot")
         logger.info("=" * 80)
         
-        # Get Zerodha credentials
-        api_key = os.getenv('ZERODHA_API_KEY')
-        api_secret = os.getenv('ZERODHA_API_SECRET')
-        access_token = os.getenv('ZERODHA_ACCESS_TOKEN')
-        
-        if not all([api_key, api_secret, access_token]):
-            raise ValueError("Missing Zerodha credentials in .env file")
-        
+        # Get Zerodha credentials (raises if missing from .env)
+        creds = get_creds()
+
         # Initialize broker
-        self.broker = ZerodhaBroker(api_key, api_secret, access_token)
+        self.broker = ZerodhaBroker(creds.api_key, creds.api_secret, creds.access_token)
         logger.info("✅ Broker initialized")
         
         # Initialize risk manager
@@ -3,19 +3,19 @@ Trading Dashboard
 Streamlit dashboard for monitoring the trading bot
 """
 
+import time
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 
-from src.data.data_fetcher import DataFetcher
-from src.data.data_processor import DataProcessor
-from src.indicators.technical_indicators import TechnicalIndicators
-from src.strategies.intraday_strategy import IntradayStrategy
-from src.risk.risk_manager import RiskManager
 from src.utils.config import config
 
+# Heavy imports (plotly, the src.* component stack) are deferred into the
+# functions that need them so every streamlit rerun doesn't pay their
+# module-import cost up front
+
 # Page configuration
 st.set_page_config(
     page_title="Intraday Trading Dashboard",
@@ -28,6 +28,14 @@ st.set_page_config(
 @st.cache_resource
 def initialize_components():
     """Initialize trading components with Zerodha"""
+    # Imported here (once per session thanks to cache_resource) to keep
+    # cold start and reruns fast
+    from src.data.data_fetcher import DataFetcher
+    from src.data.data_processor import DataProcessor
+    from src.indicators.technical_indicators import TechnicalIndicators
+    from src.strategies.intraday_strategy import IntradayStrategy
+    from src.risk.risk_manager import RiskManager
+
     data_fetcher = DataFetcher(provider="zerodha")  # Use Zerodha API
     data_processor = DataProcessor()
     indicators = TechnicalIndicators()
@@ -38,6 +46,133 @@ def initialize_components():
 
 data_fetcher, data_processor, indicators, strategy, risk_manager = initialize_components()
 
+
+def _downsample_for_chart(df, target=2000):
+    """
+    Roll long windows up into at most `target` OHLC buckets for plotting
+
+    A month of minute candles is ~9,000 rows; plotly serializes every
+    point to the browser and redraws them all on each interaction. The
+    per-bucket open/high/low/close roll-up is visually indistinguishable
+    at dashboard scale while cutting the payload several-fold.
+    """
+    if len(df) <= target:
+        return df
+
+    bucket_size = -(-len(df) // target)  # ceil division
+    buckets = np.arange(len(df)) // bucket_size
+
+    agg = {
+        'datetime': 'first',
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum'
+    }
+    # Indicator overlays average cleanly within a bucket
+    for col in ('sma_20', 'sma_50', 'bb_upper', 'bb_lower',
+                'rsi', 'macd', 'macd_signal', 'macd_histogram'):
+        if col in df.columns:
+            agg[col] = 'mean'
+
+    agg = {col: how for col, how in agg.items() if col in df.columns}
+    return df.groupby(buckets, sort=False).agg(agg)
+
+
+def _build_chart(df):
+    """Build the price/RSI/MACD chart figure for the loaded data"""
+    # plotly is only imported once a chart is actually rendered
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    df = _downsample_for_chart(df)
+
+    # Create subplots
+    fig = make_subplots(
+        rows=3, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        row_heights=[0.5, 0.25, 0.25],
+        subplot_titles=("Price & Moving Averages", "RSI", "MACD")
+    )
+
+    # Candlestick chart
+    fig.add_trace(
+        go.Candlestick(
+            x=df['datetime'],
+            open=df['open'],
+            high=df['high'],
+            low=df['low'],
+            close=df['close'],
+            name="Price"
+        ),
+        row=1, col=1
+    )
+
+    # Moving averages
+    if 'sma_20' in df.columns:
+        fig.add_trace(
+            go.Scatter(x=df['datetime'], y=df['sma_20'], name="SMA 20", line=dict(color='orange', width=1)),
+            row=1, col=1
+        )
+
+    if 'sma_50' in df.columns:
+        fig.add_trace(
+            go.Scatter(x=df['datetime'], y=df['sma_50'], name="SMA 50", line=dict(color='blue', width=1)),
+            row=1, col=1
+        )
+
+    # Bollinger Bands
+    if 'bb_upper' in df.columns:
+        fig.add_trace(
+            go.Scatter(x=df['datetime'], y=df['bb_upper'], name="BB Upper",
+                      line=dict(color='gray', width=1, dash='dash')),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=df['datetime'], y=df['bb_lower'], name="BB Lower",
+                      line=dict(color='gray', width=1, dash='dash')),
+            row=1, col=1
+        )
+
+    # RSI
+    fig.add_trace(
+        go.Scatter(x=df['datetime'], y=df['rsi'], name="RSI", line=dict(color='purple', width=2)),
+        row=2, col=1
+    )
+    fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
+    fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
+
+    # MACD
+    fig.add_trace(
+        go.Scatter(x=df['datetime'], y=df['macd'], name="MACD", line=dict(color='blue', width=1)),
+        row=3, col=1
+    )
+    fig.add_trace(
+        go.Scatter(x=df['datetime'], y=df['macd_signal'], name="Signal", line=dict(color='red', width=1)),
+        row=3, col=1
+    )
+    fig.add_trace(
+        go.Bar(x=df['datetime'], y=df['macd_histogram'], name="Histogram", marker_color='gray'),
+        row=3, col=1
+    )
+
+    # Update layout
+    fig.update_layout(
+        height=900,
+        showlegend=True,
+        xaxis_rangeslider_visible=False,
+        hovermode='x unified'
+    )
+
+    fig.update_xaxes(title_text="Date", row=3, col=1)
+    fig.update_yaxes(title_text="Price", row=1, col=1)
+    fig.update_yaxes(title_text="RSI", row=2, col=1)
+    fig.update_yaxes(title_text="MACD", row=3, col=1)
+
+    return fig
+
 # Sidebar
 st.sidebar.title("⚙️ Settings")
 
@@ -73,10 +208,25 @@ st.sidebar.markdown(f"{status_color} **{status_text}**")
 st.title("📈 Intraday Trading Dashboard")
 st.markdown(f"**Symbol:** {selected_symbol} | **Interval:** {interval} | **Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-# Fetch data
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_data(symbol, interval, days):
-    """Fetch and process data"""
+def _current_session_id():
+    """
+    Cache-key bucket that only advances while the market is open
+
+    During market hours this rolls over every 5 minutes, matching the
+    refresh cadence. When the market is closed it pins to the day's ISO
+    date, so an idle dashboard stops refetching data that cannot change.
+    """
+    if data_fetcher.is_market_open():
+        return int(time.time() // 300)
+    return datetime.now().date().isoformat()
+
+
+# Fetch data - the session_id argument replaces a plain ttl: it rolls the
+# cache key every 5 minutes while the market is open but holds it steady
+# when closed, so idle dashboards stop hitting the broker for stale data
+@st.cache_data(max_entries=64)
+def get_raw_data(symbol, interval, days, session_id):
+    """Fetch and clean raw OHLCV data (session_id busts the cache)"""
     df = data_fetcher.get_historical_data(symbol, interval, days)
     if not df.empty:
         # Ensure datetime is a column (Zerodha returns it as index)
@@ -84,11 +234,36 @@ def get_data(symbol, interval, days):
             df.reset_index(inplace=True)
             if df.columns[0] != 'datetime':
                 df.rename(columns={df.columns[0]: 'datetime'}, inplace=True)
-        
+
         df = data_processor.clean_data(df)
-        df = indicators.calculate_all_indicators(df)
     return df
 
+
+def get_data(symbol, interval, days):
+    """Fetch data and apply indicators, updating incrementally on refresh"""
+    df = get_raw_data(symbol, interval, days, _current_session_id())
+    if df.empty:
+        return df
+
+    # Keep the previous indicated frame per view so a refresh only computes
+    # indicators for the bars that are actually new
+    state_key = f"ind_state::{symbol}::{interval}::{days}"
+    prev_df = st.session_state.get(state_key)
+
+    if prev_df is not None and not prev_df.empty and 'datetime' in prev_df.columns:
+        new_bars = df[df['datetime'] > prev_df['datetime'].iloc[-1]]
+        if new_bars.empty:
+            return prev_df
+        if len(new_bars) < len(df):
+            result = indicators.calculate_incremental(prev_df, new_bars)
+        else:
+            result = indicators.calculate_all_indicators(df)
+    else:
+        result = indicators.calculate_all_indicators(df)
+
+    st.session_state[state_key] = result
+    return result
+
 df = get_data(selected_symbol, interval, days)
 
 if df.empty:
@@ -98,11 +273,13 @@ if df.empty:
 # Get current quote
 quote = data_fetcher.get_real_time_quote(selected_symbol)
 
-# Metrics row
+# Metrics row - grab the last row once instead of five df.iloc[-1] lookups
+last = df.iloc[-1]
+
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    current_price = quote.get('price', df.iloc[-1]['close'])
+    current_price = quote.get('price', last['close'])
     st.metric("Current Price", f"₹{current_price:.2f}")
 
 with col2:
@@ -111,17 +288,17 @@ with col2:
     st.metric("Change", f"₹{change:.2f}", f"{change_pct:.2f}%")
 
 with col3:
-    volume = quote.get('volume', df.iloc[-1]['volume'])
+    volume = quote.get('volume', last['volume'])
     st.metric("Volume", f"{volume:,.0f}")
 
 with col4:
-    rsi = df.iloc[-1]['rsi']
+    rsi = last['rsi']
     rsi_color = "🔴" if rsi > 70 else "🟢" if rsi < 30 else "⚪"
     st.metric("RSI", f"{rsi:.2f} {rsi_color}")
 
 with col5:
-    macd = df.iloc[-1]['macd']
-    macd_signal = df.iloc[-1]['macd_signal']
+    macd = last['macd']
+    macd_signal = last['macd_signal']
     macd_trend = "📈" if macd > macd_signal else "📉"
     st.metric("MACD", f"{macd:.4f} {macd_trend}")
 
@@ -159,89 +336,7 @@ with col_strength:
 st.markdown("---")
 st.subheader("📉 Price Chart with Indicators")
 
-# Create subplots
-fig = make_subplots(
-    rows=3, cols=1,
-    shared_xaxes=True,
-    vertical_spacing=0.05,
-    row_heights=[0.5, 0.25, 0.25],
-    subplot_titles=("Price & Moving Averages", "RSI", "MACD")
-)
-
-# Candlestick chart
-fig.add_trace(
-    go.Candlestick(
-        x=df['datetime'],
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close'],
-        name="Price"
-    ),
-    row=1, col=1
-)
-
-# Moving averages
-if 'sma_20' in df.columns:
-    fig.add_trace(
-        go.Scatter(x=df['datetime'], y=df['sma_20'], name="SMA 20", line=dict(color='orange', width=1)),
-        row=1, col=1
-    )
-
-if 'sma_50' in df.columns:
-    fig.add_trace(
-        go.Scatter(x=df['datetime'], y=df['sma_50'], name="SMA 50", line=dict(color='blue', width=1)),
-        row=1, col=1
-    )
-
-# Bollinger Bands
-if 'bb_upper' in df.columns:
-    fig.add_trace(
-        go.Scatter(x=df['datetime'], y=df['bb_upper'], name="BB Upper", 
-                  line=dict(color='gray', width=1, dash='dash')),
-        row=1, col=1
-    )
-    fig.add_trace(
-        go.Scatter(x=df['datetime'], y=df['bb_lower'], name="BB Lower",
-                  line=dict(color='gray', width=1, dash='dash')),
-        row=1, col=1
-    )
-
-# RSI
-fig.add_trace(
-    go.Scatter(x=df['datetime'], y=df['rsi'], name="RSI", line=dict(color='purple', width=2)),
-    row=2, col=1
-)
-fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
-fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
-
-# MACD
-fig.add_trace(
-    go.Scatter(x=df['datetime'], y=df['macd'], name="MACD", line=dict(color='blue', width=1)),
-    row=3, col=1
-)
-fig.add_trace(
-    go.Scatter(x=df['datetime'], y=df['macd_signal'], name="Signal", line=dict(color='red', width=1)),
-    row=3, col=1
-)
-fig.add_trace(
-    go.Bar(x=df['datetime'], y=df['macd_histogram'], name="Histogram", marker_color='gray'),
-    row=3, col=1
-)
-
-# Update layout
-fig.update_layout(
-    height=900,
-    showlegend=True,
-    xaxis_rangeslider_visible=False,
-    hovermode='x unified'
-)
-
-fig.update_xaxes(title_text="Date", row=3, col=1)
-fig.update_yaxes(title_text="Price", row=1, col=1)
-fig.update_yaxes(title_text="RSI", row=2, col=1)
-fig.update_yaxes(title_text="MACD", row=3, col=1)
-
+fig = _build_chart(df)
 st.plotly_chart(fig, use_container_width=True)
 
 # Portfolio section
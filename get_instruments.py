@@ -3,9 +3,17 @@ Fetch Instrument Tokens from Zerodha
 Required for WebSocket streaming
 """
 
-import os
+import argparse
+import codecs
+import csv
+import gzip
+import hashlib
 import json
-from dotenv import load_dotenv
+import pickle
+
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
 
 try:
     from kiteconnect import KiteConnect
@@ -15,102 +23,290 @@ except ImportError:
     print("Run: pip install kiteconnect")
     exit(1)
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+from src.utils.creds import try_get_creds
+
+# The NSE instruments dump is multi-MB and published once per trading day,
+# so warm re-runs read a local gzip pickle instead of hitting Kite's API
+CACHE_DIR = Path('.cache')
+
+# NIFTY 50 symbols (without .NS suffix for NSE instruments API).
+# A frozenset makes the per-row membership test a single hash lookup
+# instead of a 50-element list scan over ~100k rows.
+NIFTY50_SYMBOLS = frozenset({
+    "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK",
+    "HINDUNILVR", "ITC", "SBIN", "BHARTIARTL", "KOTAKBANK",
+    "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "HCLTECH",
+    "BAJFINANCE", "TITAN", "SUNPHARMA", "ULTRACEMCO", "NESTLEIND",
+    "WIPRO", "ONGC", "NTPC", "POWERGRID", "TECHM",
+    "M&M", "TATAMOTORS", "TATASTEEL", "INDUSINDBK", "BAJAJFINSV",
+    "ADANIENT", "COALINDIA", "DRREDDY", "GRASIM", "HINDALCO",
+    "DIVISLAB", "CIPLA", "EICHERMOT", "SHREECEM", "APOLLOHOSP",
+    "BPCL", "JSWSTEEL", "HEROMOTOCO", "BRITANNIA", "TATACONSUM",
+    "SBILIFE", "ADANIPORTS", "UPL", "BAJAJ-AUTO", "HDFCLIFE"
+})
+
+
+def _stream_matching_instruments(kite, wanted):
+    """
+    Stream the NSE instruments CSV and keep only the wanted rows
+
+    kite.instruments() materializes the full ~100k-row dump as Python
+    dicts before any filtering. Hitting the CSV endpoint with stream=True
+    and filtering inside csv.DictReader keeps peak memory at the ~50
+    matching rows, and the download stops early once they are all found.
+
+    Args:
+        kite: Authenticated KiteConnect instance
+        wanted: Set of tradingsymbols to keep
+
+    Returns:
+        List of matching instrument row dicts
+    """
+    headers = {
+        'X-Kite-Version': '3',
+        'Authorization': f"token {kite.api_key}:{kite.access_token}"
+    }
+
+    matches = []
+    with kite.reqsession.get(
+        f"{kite.root}/instruments/NSE",
+        headers=headers,
+        stream=True,
+        timeout=30
+    ) as response:
+        response.raise_for_status()
+
+        lines = codecs.iterdecode(response.iter_lines(), 'utf-8')
+        for row in csv.DictReader(lines):
+            if row['tradingsymbol'] in wanted:
+                row['instrument_token'] = int(row['instrument_token'])
+                matches.append(row)
+
+                if len(matches) == len(wanted):
+                    break
+
+    return matches
+
+
+def _dump_json(path, obj):
+    """Write an indented JSON file (orjson when available, stdlib otherwise)"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+
+def _load_meta() -> dict:
+    """Load .cache/meta.json, or an empty dict when absent/corrupt"""
+    try:
+        with open(CACHE_DIR / 'meta.json', 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_meta(meta):
+    """Write .cache/meta.json"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    _dump_json(CACHE_DIR / 'meta.json', meta)
+
+
+def _dump_json_if_changed(path, obj) -> bool:
+    """
+    Write a JSON file only when its content actually changed
+
+    Serializes once, hashes the payload, and compares against the hash
+    recorded in .cache/meta.json from the previous run. Identical content
+    is skipped, which also leaves the file's mtime alone so hash-keyed
+    readers (the dashboards) keep their parsed copy cached.
+
+    Args:
+        path: Destination file path
+        obj: JSON-serializable object
+
+    Returns:
+        True when the file was (re)written, False when skipped
+    """
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(obj, indent=2).encode('utf-8')
+
+    digest = hashlib.blake2s(payload, digest_size=8).hexdigest()
+
+    meta = _load_meta()
+    hashes = meta.setdefault('file_hashes', {})
+
+    if hashes.get(str(path)) == digest and Path(path).exists():
+        return False
+
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+    hashes[str(path)] = digest
+    _save_meta(meta)
+    return True
 
-def get_instrument_tokens():
+
+def _cache_path() -> Path:
+    """Path of today's instruments cache file"""
+    return CACHE_DIR / f"nse_instruments_{datetime.now().strftime('%Y%m%d')}.pkl.gz"
+
+
+def _load_cached_instruments():
+    """Load today's cached instruments dump, or None on a cache miss"""
+    cache_file = _cache_path()
+
+    if not cache_file.exists():
+        return None
+
+    try:
+        with gzip.open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError) as e:
+        print(f"⚠️ Could not read instruments cache ({e}), refetching")
+        return None
+
+
+def _save_cached_instruments(instruments):
+    """Write the instruments dump and a small metadata sidecar to .cache/"""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+
+        with gzip.open(_cache_path(), 'wb') as f:
+            pickle.dump(instruments, f)
+
+        meta = _load_meta()
+        meta['fetched_at'] = datetime.now().isoformat()
+        meta['row_count'] = len(instruments)
+        _save_meta(meta)
+    except OSError as e:
+        print(f"⚠️ Could not write instruments cache: {e}")
+
+
+def get_instrument_tokens(force_refresh: bool = False):
     """
     Fetch instrument tokens for NIFTY 50 stocks
     Saves to instrument_tokens.json
+
+    Args:
+        force_refresh: Skip the on-disk cache and refetch from the API
     """
-    api_key = os.getenv('ZERODHA_API_KEY')
-    access_token = os.getenv('ZERODHA_ACCESS_TOKEN')
-    
-    if not api_key or not access_token:
-        print("❌ Missing Zerodha credentials in .env file")
-        print("Required: ZERODHA_API_KEY and ZERODHA_ACCESS_TOKEN")
-        exit(1)
-    
     print("\n" + "="*80)
     print(" FETCHING INSTRUMENT TOKENS FROM ZERODHA")
     print("="*80 + "\n")
-    
-    # Initialize Kite
-    kite = KiteConnect(api_key=api_key)
-    kite.set_access_token(access_token)
-    
-    print("📡 Fetching instruments from NSE...")
-    
-    try:
-        # Get all NSE instruments
-        instruments = kite.instruments("NSE")
-        print(f"✅ Fetched {len(instruments)} instruments from NSE\n")
-    except Exception as e:
-        print(f"❌ Error fetching instruments: {e}")
-        print("Check if your access token is valid (run: python zerodha_login.py)")
-        exit(1)
-    
-    # NIFTY 50 symbols (without .NS suffix for NSE instruments API)
-    nifty50_symbols = [
-        "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK",
-        "HINDUNILVR", "ITC", "SBIN", "BHARTIARTL", "KOTAKBANK",
-        "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "HCLTECH",
-        "BAJFINANCE", "TITAN", "SUNPHARMA", "ULTRACEMCO", "NESTLEIND",
-        "WIPRO", "ONGC", "NTPC", "POWERGRID", "TECHM",
-        "M&M", "TATAMOTORS", "TATASTEEL", "INDUSINDBK", "BAJAJFINSV",
-        "ADANIENT", "COALINDIA", "DRREDDY", "GRASIM", "HINDALCO",
-        "DIVISLAB", "CIPLA", "EICHERMOT", "SHREECEM", "APOLLOHOSP",
-        "BPCL", "JSWSTEEL", "HEROMOTOCO", "BRITANNIA", "TATACONSUM",
-        "SBILIFE", "ADANIPORTS", "UPL", "BAJAJ-AUTO", "HDFCLIFE"
-    ]
-    
+
+    instruments = None if force_refresh else _load_cached_instruments()
+
+    if instruments is not None:
+        print(f"✅ Loaded {len(instruments)} instruments from today's cache\n")
+    else:
+        creds = try_get_creds()
+
+        if creds is None:
+            print("❌ Missing Zerodha credentials in .env file")
+            print("Required: ZERODHA_API_KEY and ZERODHA_ACCESS_TOKEN")
+            exit(1)
+
+        # Initialize Kite
+        kite = KiteConnect(api_key=creds.api_key)
+        kite.set_access_token(creds.access_token)
+
+        print("📡 Fetching instruments from NSE...")
+
+        try:
+            # Stream-parse the CSV, keeping only the NIFTY 50 rows
+            instruments = _stream_matching_instruments(kite, NIFTY50_SYMBOLS)
+            print(f"✅ Streamed {len(instruments)} matching instruments from NSE\n")
+        except Exception as stream_error:
+            print(f"⚠️ Streaming fetch failed ({stream_error}), trying full dump")
+            try:
+                # Fall back to the full materialized dump
+                instruments = kite.instruments("NSE")
+                print(f"✅ Fetched {len(instruments)} instruments from NSE\n")
+            except Exception as e:
+                print(f"❌ Error fetching instruments: {e}")
+                print("Check if your access token is valid (run: python zerodha_login.py)")
+                exit(1)
+
+        _save_cached_instruments(instruments)
+
     print("🔍 Mapping NIFTY 50 symbols to instrument tokens...")
-    
-    # Build token mapping
-    token_map = {}
-    symbol_map = {}  # For display
-    
-    for instrument in instruments:
-        symbol = instrument['tradingsymbol']
-        
-        if symbol in nifty50_symbols:
-            # Use .NS suffix for consistency with rest of bot
-            full_symbol = symbol + ".NS"
-            token = instrument['instrument_token']
-            
-            token_map[full_symbol] = token
-            symbol_map[full_symbol] = {
-                'token': token,
-                'name': instrument['name'],
-                'exchange': instrument['exchange']
-            }
-    
+
+    # Filter the ~100k-row dump vectorized instead of looping row dicts
+    # in the interpreter; isin() does the membership test in C
+    df = pd.DataFrame(instruments)[
+        ['tradingsymbol', 'instrument_token', 'name', 'exchange']
+    ]
+    hits = df[df['tradingsymbol'].isin(NIFTY50_SYMBOLS)]
+
+    # Keep the last row per symbol, matching the old loop's overwrite
+    # behaviour when the dump lists a symbol more than once
+    hits = hits.drop_duplicates('tradingsymbol', keep='last')
+
+    # Use .NS suffix for consistency with rest of bot - one vectorized
+    # concat instead of a per-row string alloc; .tolist() gives plain
+    # Python ints/strs so the JSON dumps below work unchanged
+    full_symbols = (hits['tradingsymbol'] + '.NS').tolist()
+    tokens = hits['instrument_token'].tolist()
+
+    token_map = dict(zip(full_symbols, tokens))
+    symbol_map = {  # For display
+        full_symbol: {'token': token, 'name': name, 'exchange': exchange}
+        for full_symbol, token, name, exchange in zip(
+            full_symbols, tokens, hits['name'].tolist(), hits['exchange'].tolist()
+        )
+    }
+
     print(f"✅ Found {len(token_map)} NIFTY 50 instruments\n")
-    
+
     # Display some examples
     print("📋 Sample mappings:")
     for symbol, data in list(symbol_map.items())[:5]:
         print(f"   {symbol:20} → Token: {data['token']:10} ({data['name']})")
     print("   ...\n")
-    
-    # Save to JSON
+
+    # Save to JSON (orjson serializes in C; readers still use json.load).
+    # Unchanged content is skipped so downstream hash-keyed caches stay warm.
     output_file = 'instrument_tokens.json'
-    with open(output_file, 'w') as f:
-        json.dump(token_map, f, indent=2)
-    
-    print(f"💾 Saved to: {output_file}")
-    
+    if _dump_json_if_changed(output_file, token_map):
+        print(f"💾 Saved to: {output_file}")
+    else:
+        print(f"💾 {output_file} unchanged, skipped write")
+
+    # Mirror as MessagePack - binary decode is a few times faster than
+    # JSON, and readers fall back to the .json when msgpack is missing
+    if MSGPACK_AVAILABLE:
+        msgpack_file = 'instrument_tokens.msgpack'
+        with open(msgpack_file, 'wb') as f:
+            f.write(msgpack.packb(token_map))
+        print(f"💾 Saved MessagePack mirror to: {msgpack_file}")
+
     # Save detailed mapping too
     detail_file = 'instrument_details.json'
-    with open(detail_file, 'w') as f:
-        json.dump(symbol_map, f, indent=2)
-    
-    print(f"💾 Saved details to: {detail_file}")
-    
+    if _dump_json_if_changed(detail_file, symbol_map):
+        print(f"💾 Saved details to: {detail_file}")
+    else:
+        print(f"💾 {detail_file} unchanged, skipped write")
+
     print("\n" + "="*80)
     print(" SUCCESS!")
     print("="*80 + "\n")
-    
+
     print("✅ Instrument tokens ready for WebSocket streaming")
     print(f"✅ {len(token_map)} NIFTY 50 stocks mapped")
     print("\n📝 Next steps:")
@@ -118,13 +314,21 @@ def get_instrument_tokens():
     print("   2. Start WebSocket connection")
     print("   3. Subscribe to real-time ticks")
     print("   4. Enjoy instant signal detection! 🚀\n")
-    
+
     return token_map
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fetch NIFTY 50 instrument tokens')
+    parser.add_argument(
+        '--force-refresh',
+        action='store_true',
+        help='Ignore the daily instruments cache and refetch from the API'
+    )
+    args = parser.parse_args()
+
     try:
-        tokens = get_instrument_tokens()
+        tokens = get_instrument_tokens(force_refresh=args.force_refresh)
     except KeyboardInterrupt:
         print("\n\n❌ Interrupted by user")
     except Exception as e:
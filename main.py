@@ -4,14 +4,21 @@ Entry point for the intraday trading bot
 """
 
 import argparse
+import asyncio
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import schedule
+
+import pandas as pd
 
 from src.data.data_fetcher import DataFetcher
 from src.data.data_processor import DataProcessor
 from src.strategies.intraday_strategy import IntradayStrategy
 from src.risk.risk_manager import RiskManager
+from src.utils.creds import try_get_creds
+from src.utils.instruments import load_instrument_tokens
 from src.utils.logger import get_logger
 from src.utils.config import config
 from src.utils.market_hours import check_market_hours, get_market_status_detailed
@@ -22,29 +29,60 @@ logger = get_logger('main', config.get('logging'))
 class TradingBot:
     """Main trading bot class"""
     
-    def __init__(self, mode: str = "paper"):
+    def __init__(self, mode: str = "paper", data_fetcher: DataFetcher = None):
         """
         Initialize trading bot with Zerodha
-        
+
         Args:
             mode: Trading mode (paper or live)
+            data_fetcher: Optional pre-built fetcher to share its broker
+                session (a new one is created when omitted)
         """
         self.mode = mode
-        self.data_fetcher = DataFetcher(provider="zerodha")  # Use Zerodha
+        self.data_fetcher = data_fetcher or DataFetcher(provider="zerodha")  # Use Zerodha
         self.data_processor = DataProcessor()
         self.strategy = IntradayStrategy()
         self.risk_manager = RiskManager()
         
         self.trading_config = config.get_trading_config()
         self.symbols = self.trading_config.get('symbols', [])
-        
+
+        # Lock guarding position mutations from the worker threads (API
+        # pacing lives in DataFetcher's token buckets)
+        self._position_lock = threading.Lock()
+
+        # Hoist the per-symbol fetch parameters out of process_symbol,
+        # which reads them once per symbol per cycle otherwise
+        data_config = config.get_data_config()
+        self._interval = data_config.get('interval', '5min')
+        self._lookback_days = data_config.get('lookback_days', 5)
+
+        # Precompute the exit multipliers once - open_position runs at
+        # tick rate in websocket mode, so it shouldn't re-read the config
+        # dict and redo the arithmetic per signal
+        exit_config = self.strategy.strategy_config.get('exit', {})
+        self._sl_mult = 1 - exit_config.get('stop_loss', 0.01)
+        self._tp_mult = 1 + exit_config.get('profit_target', 0.02)
+
+        # WebSocket streaming state (push-driven trading cycles)
+        self.stream = None
+        self._bar_buckets = {}
+        self.bar_interval_minutes = 5
+
+        # Per-symbol cleaned bar history, so each cycle only cleans the
+        # bars that arrived since the previous cycle instead of re-running
+        # clean_data over the full lookback window for every symbol.
+        # Each symbol is handled by at most one worker thread per cycle,
+        # so plain dict item assignment is safe here.
+        self._bars = {}
+
         logger.info(f"Initialized TradingBot in {mode} mode with Zerodha API")
         logger.info(f"Watching {len(self.symbols)} NIFTY 50 stocks")
     
     def run_trading_cycle(self):
         """Execute one trading cycle"""
         logger.info("=" * 50)
-        logger.info(f"Starting trading cycle at {datetime.now()}")
+        logger.info("Starting trading cycle at %s", datetime.now())
         
         # Check if market is open
         if not self.data_fetcher.is_market_open():
@@ -54,21 +92,73 @@ class TradingBot:
         # Get portfolio summary
         portfolio = self.risk_manager.get_portfolio_summary()
         logger.info(
-            f"Portfolio: ${portfolio['total_value']:,.2f} | "
-            f"Cash: ${portfolio['cash']:,.2f} | "
-            f"Positions: {portfolio['num_positions']} | "
-            f"P&L: ${portfolio['unrealized_pnl']:,.2f}"
+            "Portfolio: $%.2f | Cash: $%.2f | Positions: %d | P&L: $%.2f",
+            portfolio['total_value'],
+            portfolio['cash'],
+            portfolio['num_positions'],
+            portfolio['unrealized_pnl']
         )
         
-        # Process each symbol
-        for symbol in self.symbols:
-            try:
-                self.process_symbol(symbol)
-            except Exception as e:
-                logger.error(f"Error processing {symbol}: {str(e)}", exc_info=True)
-        
+        # One bulk quote call pre-filters the watchlist, so only symbols
+        # actually moving (or holding an open position) pay the per-symbol
+        # historical fetch - 50 API calls per cycle drop to one plus a few
+        symbols_to_process = self._prefilter_symbols()
+
+        # Process symbols concurrently - each one blocks on a Zerodha HTTP
+        # round-trip, so overlapping them collapses the cycle from the sum
+        # of the fetch latencies to roughly one
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(self._safe_process, symbols_to_process))
+
         logger.info("Trading cycle complete")
-    
+
+    def _prefilter_symbols(self):
+        """
+        Narrow the watchlist with a single bulk quote call
+
+        Symbols with an open position always pass (exit logic must run).
+        Otherwise a symbol is only processed when its price has moved from
+        the previous close by at least prefilter_min_move_pct percent.
+        Falls back to the full list if bulk quotes are unavailable.
+
+        Returns:
+            List of symbols worth a full historical fetch this cycle
+        """
+        quotes = self.data_fetcher.get_quotes_bulk(self.symbols)
+        if not quotes:
+            return self.symbols
+
+        min_move_pct = self.trading_config.get('prefilter_min_move_pct', 0.1)
+        selected = []
+
+        for symbol in self.symbols:
+            if symbol in self.risk_manager.positions:
+                selected.append(symbol)
+                continue
+
+            quote = quotes.get(symbol)
+            if not quote or not quote.get('close') or not quote.get('price'):
+                # No usable quote - keep the symbol rather than miss it
+                selected.append(symbol)
+                continue
+
+            move_pct = abs(quote['price'] - quote['close']) / quote['close'] * 100
+            if move_pct >= min_move_pct:
+                selected.append(symbol)
+
+        logger.info(
+            "Pre-filter: %d/%d symbols pass the bulk quote check",
+            len(selected), len(self.symbols)
+        )
+        return selected
+
+    def _safe_process(self, symbol: str):
+        """Process one symbol, containing any error to that symbol"""
+        try:
+            self.process_symbol(symbol)
+        except Exception as e:
+            logger.error("Error processing %s: %s", symbol, e, exc_info=True)
+
     def process_symbol(self, symbol: str):
         """
         Process a single symbol
@@ -76,37 +166,75 @@ class TradingBot:
         Args:
             symbol: Stock symbol to process
         """
-        logger.info(f"Processing {symbol}...")
+        logger.info("Processing %s...", symbol)
         
-        # Fetch recent data
-        data_config = config.get_data_config()
+        # Fetch recent data (DataFetcher paces this to Kite's rate limit)
         df = self.data_fetcher.get_historical_data(
             symbol,
-            interval=data_config.get('interval', '5min'),
-            days=data_config.get('lookback_days', 5)
+            interval=self._interval,
+            days=self._lookback_days
         )
         
         if df.empty:
-            logger.warning(f"No data available for {symbol}")
+            logger.warning("No data available for %s", symbol)
             return
-        
-        # Clean and process data
-        df = self.data_processor.clean_data(df)
-        
+
+        # Clean and process data (incrementally - see _update_bars)
+        df = self._update_bars(symbol, df)
+
         # Generate trading signals
         signals = self.strategy.generate_signals(df, symbol)
         
         if not signals:
-            logger.info(f"No signals generated for {symbol}")
+            logger.info("No signals generated for %s", symbol)
             return
-        
+
         # Process the most recent signal
         latest_signal = signals[0]
-        logger.info(f"Signal for {symbol}: {latest_signal}")
+        logger.info("Signal for %s: %s", symbol, latest_signal)
         
         # Execute trades based on signal
         self.execute_signal(latest_signal)
-    
+
+    def _update_bars(self, symbol: str, df):
+        """
+        Merge freshly fetched bars into the in-memory history for a symbol
+
+        clean_data only runs over the rows at or after the last cached
+        timestamp (the newest bar is re-cleaned because it may have been
+        partial last cycle); everything older is reused as-is. The history
+        is capped at roughly the lookback window so memory stays bounded
+        over a long session.
+
+        Args:
+            symbol: Stock symbol the bars belong to
+            df: Raw OHLCV DataFrame just fetched for the symbol
+
+        Returns:
+            Cleaned DataFrame covering the full lookback window
+        """
+        max_bars = self._lookback_days * 75  # ~75 five-minute bars per session
+
+        cached = self._bars.get(symbol)
+        if cached is None or cached.empty:
+            cleaned = self.data_processor.clean_data(df)
+        else:
+            last_ts = cached.index.max()
+            fresh = df[df.index >= last_ts]
+
+            if fresh.empty:
+                # Nothing new this cycle - serve the cached history
+                return cached
+
+            cleaned = pd.concat([
+                cached[cached.index < last_ts],
+                self.data_processor.clean_data(fresh)
+            ])
+
+        cleaned = cleaned.tail(max_bars)
+        self._bars[symbol] = cleaned
+        return cleaned
+
     def execute_signal(self, signal):
         """
         Execute a trading signal
@@ -115,7 +243,16 @@ class TradingBot:
             signal: Trading signal to execute
         """
         symbol = signal.symbol
-        
+
+        # Signals now arrive from worker threads, so serialize everything
+        # that reads or mutates the shared risk_manager.positions
+        with self._position_lock:
+            self._execute_signal_locked(signal)
+
+    def _execute_signal_locked(self, signal):
+        """Execute a signal while holding the position lock"""
+        symbol = signal.symbol
+
         # Check if we already have a position
         if symbol in self.risk_manager.positions:
             # Check exit conditions
@@ -126,12 +263,12 @@ class TradingBot:
             
             # Check stop loss and take profit
             if self.risk_manager.check_stop_loss(symbol):
-                logger.info(f"Closing {symbol} due to stop loss")
+                logger.info("Closing %s due to stop loss", symbol)
                 self.close_position(symbol, signal.price, "Stop Loss")
                 return
-            
+
             if self.risk_manager.check_take_profit(symbol):
-                logger.info(f"Closing {symbol} due to take profit")
+                logger.info("Closing %s due to take profit", symbol)
                 self.close_position(symbol, signal.price, "Take Profit")
                 return
             
@@ -143,7 +280,7 @@ class TradingBot:
             )
             
             if should_exit:
-                logger.info(f"Closing {symbol}: {reason}")
+                logger.info("Closing %s: %s", symbol, reason)
                 self.close_position(symbol, signal.price, reason)
                 return
         
@@ -153,7 +290,7 @@ class TradingBot:
         
         # For SELL signals without existing position (shorting)
         elif signal.signal_type.value == "SELL":
-            logger.info(f"SELL signal for {symbol} (no position to close, shorting not implemented)")
+            logger.info("SELL signal for %s (no position to close, shorting not implemented)", symbol)
     
     def open_position(self, signal):
         """
@@ -164,14 +301,10 @@ class TradingBot:
         """
         symbol = signal.symbol
         entry_price = signal.price
-        
-        # Calculate stop loss and take profit
-        exit_config = self.strategy.strategy_config.get('exit', {})
-        stop_loss_pct = exit_config.get('stop_loss', 0.01)
-        profit_target_pct = exit_config.get('profit_target', 0.02)
-        
-        stop_loss = entry_price * (1 - stop_loss_pct)
-        take_profit = entry_price * (1 + profit_target_pct)
+
+        # Calculate stop loss and take profit from the cached multipliers
+        stop_loss = entry_price * self._sl_mult
+        take_profit = entry_price * self._tp_mult
         
         # Calculate position size
         quantity = self.risk_manager.calculate_position_size(
@@ -182,20 +315,20 @@ class TradingBot:
         )
         
         if quantity == 0:
-            logger.warning(f"Position size is 0 for {symbol}")
+            logger.warning("Position size is 0 for %s", symbol)
             return
-        
+
         # Check if we can open position
         estimated_cost = quantity * entry_price
         if not self.risk_manager.can_open_position(symbol, estimated_cost):
-            logger.warning(f"Cannot open position in {symbol}")
+            logger.warning("Cannot open position in %s", symbol)
             return
-        
+
         # Execute order (in paper trading, just update risk manager)
         if self.mode == "paper":
             logger.info(
-                f"[PAPER] BUY {quantity} shares of {symbol} @ ${entry_price:.2f} "
-                f"| SL: ${stop_loss:.2f} | TP: ${take_profit:.2f}"
+                "[PAPER] BUY %d shares of %s @ $%.2f | SL: $%.2f | TP: $%.2f",
+                quantity, symbol, entry_price, stop_loss, take_profit
             )
             self.risk_manager.add_position(
                 symbol, quantity, entry_price, stop_loss, take_profit
@@ -217,37 +350,140 @@ class TradingBot:
             position = self.risk_manager.remove_position(symbol, exit_price)
             if position:
                 logger.info(
-                    f"[PAPER] SELL {position.quantity} shares of {symbol} @ ${exit_price:.2f} "
-                    f"| Reason: {reason} "
-                    f"| P&L: ${position.unrealized_pnl:.2f}"
+                    "[PAPER] SELL %d shares of %s @ $%.2f | Reason: %s | P&L: $%.2f",
+                    position.quantity, symbol, exit_price, reason, position.unrealized_pnl
                 )
         else:
             # In live mode, execute actual order via broker API
             logger.info("Live trading not implemented yet")
     
+    def start_streaming(self) -> bool:
+        """
+        Drive trading cycles from KiteTicker websocket ticks
+
+        Each tick is bucketed into its 5-minute bar; a symbol is only
+        processed when one of its bars closes, so signals fire on bar
+        close instead of on a fixed polling timer.
+
+        Returns:
+            True if the websocket stream started, False if unavailable
+        """
+        creds = try_get_creds()
+
+        if creds is None:
+            logger.warning("Zerodha credentials missing, cannot start websocket mode")
+            return False
+
+        tokens_data = load_instrument_tokens()
+        if tokens_data is None:
+            logger.warning("instrument_tokens.json not found, cannot start websocket mode")
+            return False
+
+        try:
+            from src.data.realtime_stream import RealtimeDataStream
+
+            tokens = {sym: tok for sym, tok in tokens_data.items() if sym in self.symbols}
+            if not tokens:
+                logger.warning("No instrument tokens for watchlist symbols")
+                return False
+
+            def on_tick(symbol, tick):
+                self._on_bar_tick(symbol)
+
+            self.stream = RealtimeDataStream(api_key=creds.api_key, access_token=creds.access_token)
+            self.stream.register_tick_callback(on_tick)
+            self.stream.subscribe(list(tokens.keys()), tokens)
+            self.stream.start()
+
+            # Also start the broker's own tick cache so the per-bar
+            # quote reads in _process_symbol come from streamed ticks
+            # instead of REST round trips; best-effort, quotes fall
+            # back to REST if it doesn't come up
+            try:
+                self.data_fetcher.broker.start_ticker(list(tokens.keys()))
+            except Exception as e:
+                logger.warning(f"Broker tick cache unavailable, quotes stay on REST: {e}")
+
+            logger.info(f"📡 WebSocket mode: watching {len(tokens)} symbols on bar close")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to start websocket mode: {e}")
+            self.stream = None
+            return False
+
+    def _on_bar_tick(self, symbol: str):
+        """Process a symbol when a tick crosses its 5-minute bar boundary"""
+        now = datetime.now()
+        bucket = now.replace(
+            minute=(now.minute // self.bar_interval_minutes) * self.bar_interval_minutes,
+            second=0,
+            microsecond=0
+        )
+
+        previous_bucket = self._bar_buckets.get(symbol)
+        self._bar_buckets[symbol] = bucket
+
+        # Only process when a bar has just closed for this symbol
+        if previous_bucket is None or previous_bucket == bucket:
+            return
+
+        self._safe_process(symbol)
+
     def start(self, interval_minutes: int = 5):
         """
         Start the trading bot
-        
+
+        Prefers websocket-driven processing (cycles fire on bar close);
+        falls back to the scheduled polling loop when the stream is
+        unavailable.
+
         Args:
-            interval_minutes: How often to run trading cycle (in minutes)
+            interval_minutes: Polling-fallback cycle interval (in minutes)
         """
+        if self.start_streaming():
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                logger.info("Trading bot stopped by user")
+                if self.stream:
+                    self.stream.stop()
+                try:
+                    self.data_fetcher.broker.stop_ticker()
+                except Exception:
+                    pass
+                self.shutdown()
+            return
+
         logger.info(f"Starting trading bot (running every {interval_minutes} minutes)")
-        
-        # Run immediately
-        self.run_trading_cycle()
-        
-        # Schedule recurring runs
-        schedule.every(interval_minutes).minutes.do(self.run_trading_cycle)
-        
-        # Keep running
+
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            asyncio.run(self._run_polling_loop(interval_minutes))
         except KeyboardInterrupt:
             logger.info("Trading bot stopped by user")
             self.shutdown()
+
+    async def _run_polling_loop(self, interval_minutes: int):
+        """
+        Async polling loop for the no-websocket fallback
+
+        The event loop sleeps until the next cycle is due instead of the
+        old schedule + time.sleep(1) spinloop that woke every second.
+        The blocking Kite calls run in the default executor so the loop
+        stays responsive.
+
+        Args:
+            interval_minutes: Trading cycle interval (in minutes)
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            started = time.monotonic()
+            await loop.run_in_executor(None, self.run_trading_cycle)
+
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, interval_minutes * 60 - elapsed))
     
     def shutdown(self):
         """Shutdown the trading bot"""
@@ -3,25 +3,33 @@ Run Scanner Dashboard
 Launch the multi-symbol scanner dashboard
 """
 
-import subprocess
+import os
 import sys
 
+# Add parent directory to path so imports work
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
 def main():
     """Run the scanner dashboard"""
     print("🔍 Starting NIFTY 50 Scanner Dashboard...")
     print("Dashboard will open in your browser")
     print("Press Ctrl+C to stop\n")
-    
-    # Run streamlit
-    subprocess.run([
-        sys.executable,
-        "-m",
+
+    # Run streamlit in-process (like run_dashboard.py) instead of forking
+    # a second interpreter via subprocess
+    import streamlit.web.cli as stcli
+
+    dashboard_path = os.path.join(os.path.dirname(__file__), "scanner_dashboard.py")
+    sys.argv = [
         "streamlit",
         "run",
-        "scanner_dashboard.py",
+        dashboard_path,
         "--server.port=8505",
         "--server.headless=true"
-    ])
+    ]
+    sys.exit(stcli.main())
+
 
 if __name__ == '__main__':
     main()
@@ -5,12 +5,35 @@ Supports both HTTP polling and WebSocket streaming modes
 """
 
 import streamlit as st
-import pandas as pd
+import numpy as np
+import csv
+import io
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
 import os
 import json
+import random
+import time
 from dotenv import load_dotenv
 
+# Faster JSON decode for the instrument-token map when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Client-side timed refresh - schedules reruns without parking a server
+# thread in time.sleep; fall back to the sleep+rerun loop without it
+try:
+    from streamlit_autorefresh import st_autorefresh
+    AUTOREFRESH_AVAILABLE = True
+except ImportError:
+    AUTOREFRESH_AVAILABLE = False
+
 from src.scanner.multi_symbol_scanner import MultiSymbolScanner
 from src.execution.auto_executor import AutoTradeExecutor
 from src.brokers.zerodha_broker import ZerodhaBroker
@@ -20,9 +43,15 @@ from src.utils.alerting import AlertManager
 from src.data.realtime_stream import RealtimeDataStream, StreamingScanner
 from src.utils.market_hours import check_market_hours, get_market_status_detailed
 
-# Load environment variables
+# Load environment variables once; credentials can't change under a
+# running process, so read them into module constants rather than
+# re-probing os.environ on retry paths
 load_dotenv()
 
+ZERODHA_API_KEY = os.getenv('ZERODHA_API_KEY')
+ZERODHA_API_SECRET = os.getenv('ZERODHA_API_SECRET')
+ZERODHA_ACCESS_TOKEN = os.getenv('ZERODHA_ACCESS_TOKEN')
+
 # Page config
 st.set_page_config(
     page_title="NIFTY 50 Scanner",
@@ -30,8 +59,10 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS - built once at import; the element has to be re-emitted on
+# every rerun (Streamlit drops elements that are not re-rendered), but the
+# string itself never changes so Streamlit dedupes the actual send
+_CSS_HTML = """
 <style>
     .big-font {
         font-size: 24px !important;
@@ -51,43 +82,336 @@ st.markdown("""
         background-color: #f8d7da;
         border-color: #dc3545;
     }
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(110px, 1fr));
+        gap: 10px;
+        margin: 8px 0;
+    }
+    .metric-grid .mg-label {
+        display: block;
+        font-size: 14px;
+        color: #808495;
+    }
+    .metric-grid .mg-value {
+        display: block;
+        font-size: 22px;
+        font-weight: 600;
+    }
+    .symbol-grid {
+        display: grid;
+        grid-template-columns: repeat(5, 1fr);
+        gap: 4px 16px;
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS_HTML, unsafe_allow_html=True)
+
+# Monitored-symbols grid, pre-rendered at import as one HTML block (the
+# symbol list is static for the life of the process): a single widget per
+# rerun instead of a 50-way columns fan-out
+_SYMBOLS_HTML = (
+    "<div class='symbol-grid'>"
+    + "".join(f"<div>{s}</div>" for s in config.get_symbols())
+    + "</div>"
+)
+
+
+@st.cache_resource
+def _parse_instrument_tokens(mtime: float) -> dict:
+    """
+    Parse instrument_tokens.json, cached by the file's mtime
+
+    Streamlit re-runs this script top to bottom on every interaction; the
+    mtime key means the JSON is only re-decoded when the file actually
+    changed (e.g. after re-running get_instruments.py). Unlike a content
+    hash, checking mtime costs one stat call per rerun, not a full read.
+    """
+    with open('instrument_tokens.json', 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def load_instrument_tokens():
+    """
+    Load the symbol→token map, re-parsing only when the file changed
+
+    Returns None when the file is missing (run get_instruments.py first),
+    folding the exists-check into the same stat call that keys the cache.
+    """
+    try:
+        mtime = os.path.getmtime('instrument_tokens.json')
+    except OSError:
+        return None
+    return _parse_instrument_tokens(mtime)
+
+
+def render_metric_grid(pairs, container=st):
+    """
+    Render a group of label/value metrics as one HTML grid
+
+    Each st.metric is a separate widget with its own React component and
+    diff cost; collapsing a fixed-layout group into a single markdown
+    element cuts the per-rerun widget count roughly 4x. `container` lets
+    the same helper target the sidebar.
+    """
+    cells = "".join(
+        f"<div><span class='mg-label'>{label}</span>"
+        f"<span class='mg-value'>{value}</span></div>"
+        for label, value in pairs
+    )
+    container.markdown(
+        f"<div class='metric-grid'>{cells}</div>", unsafe_allow_html=True
+    )
+
+
+# st.fragment lets a card re-render independently instead of with every
+# full-page rerun; degrade to a plain function on older Streamlit
+FRAGMENT_AVAILABLE = hasattr(st, 'fragment')
+_fragment = st.fragment if FRAGMENT_AVAILABLE else (lambda func: func)
+
+# Signal cards rendered per page - the rest stays behind the paginator
+CARDS_PER_PAGE = 10
+
+# Static portion of a signal card as one HTML template: a single
+# st.markdown per card instead of one per heading/price/time/condition
+# (each call is a separate delta-generator message on the wire)
+_CARD_HEADER_TMPL = (
+    "<h3>{symbol} - {side}{badge}</h3>"
+    "<p><b>Price:</b> ₹{price:.2f} | <b>Strength:</b> {strength:.1%}</p>"
+    "<p><b>Time:</b> {timestamp}</p>"
+    "{conditions}"
+)
+
+_BADGE_TMPL = (
+    " <span style='background-color: {color}; color: white; padding: 4px 12px;"
+    " border-radius: 12px; font-size: 14px; font-weight: bold;"
+    " margin-left: 10px;'>{quality} {score}</span>"
+)
+
+
+@_fragment
+def render_signal_card(signal, idx: int):
+    """
+    Render one signal card (title badge, details, trade setup, execute)
 
+    As a fragment, the 2-second WebSocket rerun loop no longer re-parses
+    the Markdown/expander/buttons of every card on each tick; only the
+    fragment's own interactions re-run it.
+    """
+    # Hoist the enum attribute chain once per card instead of per use
+    side = signal.signal_type.value
+
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        # Extract score from reason (format: "BUY [QUALITY SCORE/8]: ...")
+        quality_text, score_text = _parse_quality_score(signal.reason)
+
+        # Title badge, color coded by quality
+        badge = ""
+        if score_text:
+            if "HIGH-PROB" in quality_text:
+                badge_color = "#28a745"  # Green
+            elif "STRONG" in quality_text:
+                badge_color = "#ffc107"  # Yellow
+            else:
+                badge_color = "#6c757d"  # Gray
+            badge = _BADGE_TMPL.format(
+                color=badge_color, quality=quality_text, score=score_text
+            )
+
+        conditions = ""
+        if signal.conditions_met:
+            conditions = (
+                "<p><b>Conditions Met:</b></p><ul>"
+                + "".join(f"<li>{c}</li>" for c in signal.conditions_met)
+                + "</ul>"
+            )
+
+        st.markdown(
+            _CARD_HEADER_TMPL.format(
+                symbol=signal.symbol,
+                side=side,
+                badge=badge,
+                price=signal.price,
+                strength=signal.strength,
+                timestamp=signal.timestamp,
+                conditions=conditions,
+            ),
+            unsafe_allow_html=True
+        )
+
+        # Expandable detailed explanation (kept separate: interactive)
+        with st.expander("📖 View Detailed Explanation"):
+            st.markdown(f"```\n{signal.get_detailed_explanation()}\n```")
+
+    with col2:
+        # Trade setup
+        if signal.stop_loss and signal.take_profit:
+            st.markdown("**Trade Setup:**")
+            setup = [
+                ("Entry", f"₹{signal.price:.2f}"),
+                ("Stop Loss", f"₹{signal.stop_loss:.2f}"),
+                ("Take Profit", f"₹{signal.take_profit:.2f}"),
+            ]
+
+            rr_ratio = signal.get_risk_reward_ratio()
+            if rr_ratio:
+                setup.append(("R:R Ratio", f"1:{rr_ratio:.2f}"))
+
+            render_metric_grid(setup)
+
+        # Execute button
+        if st.session_state.executor:
+            if st.button(f"⚡ Execute Trade", key=f"exec_{idx}"):
+                with st.spinner("Executing trade..."):
+                    result = st.session_state.executor.execute_signal(signal)
+                    if result:
+                        st.success(f"✅ Order placed! ID: {result.get('order_id', 'N/A')}")
+                    else:
+                        st.error("❌ Failed to place order")
+
+    st.markdown("---")
+
+
+# One C-level tuple build per signal instead of nine separate attribute
+# lookups when assembling CSV rows
+_CSV_FIELDS = attrgetter(
+    'symbol', 'signal_type', 'price', 'strength',
+    'stop_loss', 'take_profit', 'reason', 'timestamp'
+)
+
+_CSV_COLUMNS = [
+    'Symbol', 'Signal', 'Quality', 'Score', 'Price', 'Strength',
+    'Stop Loss', 'Take Profit', 'R:R Ratio', 'Reason', 'Timestamp'
+]
+
+
+# Matches the bracketed badge, e.g. "[HIGH-PROB 5/8]": quality label up
+# to the last space, then the score token
+_QUALITY_RE = re.compile(r'\[([^\]]*) ([^\] ]+)\]')
+
+
+@lru_cache(maxsize=512)
+def _parse_quality_score(reason) -> tuple:
+    """
+    Extract (quality, score) from a reason like 'BUY [QUALITY SCORE/8]: ...'
+
+    Memoized on the reason string: the same signals are re-rendered every
+    rerun (every 2s in WebSocket mode), so steady state is a dict hit
+    instead of fresh string splitting per signal per tick.
+    """
+    if reason:
+        match = _QUALITY_RE.search(reason)
+        if match:
+            return match.group(1), match.group(2)
+    return '', ''
+
+
+@st.cache_data(show_spinner=False)
+def signals_to_csv(signals_key: tuple, _signals) -> bytes:
+    """
+    Build the signals CSV payload, memoized per signal set
+
+    signals_key carries cheap (symbol, side, timestamp) identity tuples
+    for cache hashing; _signals (underscore = not hashed) provides the
+    actual objects. Reruns with an unchanged signal list reuse the
+    rendered CSV instead of rebuilding rows + writer output.
+
+    csv.writer on a StringIO beats DataFrame.to_csv here: the rows are
+    already plain tuples, so there is nothing for pandas to infer or
+    convert - it would only add object-dtype escaping overhead.
+    """
+    rows = []
+    for signal in _signals:
+        symbol, signal_type, price, strength, sl, tp, reason, ts = _CSV_FIELDS(signal)
+        quality_text, score_text = _parse_quality_score(reason)
+        rows.append((
+            symbol, signal_type.value, quality_text or 'N/A', score_text or 'N/A',
+            price, strength, sl, tp,
+            signal.get_risk_reward_ratio(), reason, ts
+        ))
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(_CSV_COLUMNS)
+    writer.writerows(rows)
+    # Encode inside the cache so reruns hand Streamlit ready-made bytes
+    return buf.getvalue().encode('utf-8')
+
+
+# Adaptive polling bounds for the HTTP fallback: the interval halves when
+# new signals appear and backs off toward the cap when scans come up
+# empty, with ±20% jitter so many open dashboards don't all hit the
+# broker API on the same beat
+POLL_INTERVAL_MIN = 5.0
+POLL_INTERVAL_MAX = 120.0
+
+
+@st.cache_resource
+def get_scanner() -> MultiSymbolScanner:
+    """
+    Process-wide scanner singleton shared across sessions
+
+    st.session_state is per browser tab, so every open tab used to build
+    its own MultiSymbolScanner and re-warm per-bar scan caches from
+    scratch. cache_resource hands every session the same instance: one
+    copy of the rolling state, and a bar's scan results warm once per
+    process instead of once per tab.
+    """
+    return MultiSymbolScanner()
+
+
+scanner = get_scanner()
+
+# One wall-clock read per rerun; every later "now" in the script body
+# reuses this instead of re-querying the clock
+NOW = datetime.now()
 
 # Initialize session state
 if 'scanner' not in st.session_state:
-    st.session_state.scanner = MultiSymbolScanner()
+    st.session_state.scanner = scanner
     st.session_state.scanner_running = False
     st.session_state.last_scan_time = None
     st.session_state.signals = []
     st.session_state.previous_signal_count = 0
+    st.session_state.poll_interval = 15.0  # Adaptive HTTP-fallback interval
     st.session_state.scan_mode = "WebSocket"  # DEFAULT: WebSocket for real-time streaming
     st.session_state.websocket_stream = None
     st.session_state.streaming_scanner = None
     st.session_state.websocket_connected = False
 
-if 'alert_manager' not in st.session_state:
-    # Initialize alert manager with default settings (desktop + sound enabled)
-    st.session_state.alert_manager = AlertManager({
+@st.cache_resource
+def get_alert_manager() -> AlertManager:
+    """Process-wide alert manager (desktop + sound enabled by default)"""
+    return AlertManager({
         'desktop_alerts': True,
         'sound_alerts': True,
         'email_alerts': False,
         'telegram_alerts': False
     })
 
-if 'executor' not in st.session_state:
-    # Initialize Zerodha broker
-    api_key = os.getenv('ZERODHA_API_KEY')
-    api_secret = os.getenv('ZERODHA_API_SECRET')
-    access_token = os.getenv('ZERODHA_ACCESS_TOKEN')
-    
-    if all([api_key, api_secret, access_token]):
-        broker = ZerodhaBroker(api_key, api_secret, access_token)
+
+@st.cache_resource
+def get_executor():
+    """
+    Process-wide trade executor, or None when credentials are missing
+
+    One broker + executor shared across sessions: extra browser tabs no
+    longer open duplicate Kite API connections.
+    """
+    if all([ZERODHA_API_KEY, ZERODHA_API_SECRET, ZERODHA_ACCESS_TOKEN]):
+        broker = ZerodhaBroker(ZERODHA_API_KEY, ZERODHA_API_SECRET, ZERODHA_ACCESS_TOKEN)
         risk_manager = RiskManager()
-        st.session_state.executor = AutoTradeExecutor(broker, risk_manager, dry_run=True)
-    else:
-        st.session_state.executor = None
+        return AutoTradeExecutor(broker, risk_manager, dry_run=True)
+    return None
+
+
+# session_state keeps aliasing the singletons so existing references work
+st.session_state.alert_manager = get_alert_manager()
+st.session_state.executor = get_executor()
 
 
 # Title
@@ -161,8 +485,10 @@ if st.session_state.scan_mode == "WebSocket":
     
     if st.session_state.websocket_connected:
         st.sidebar.success("Connected & Streaming")
-        st.sidebar.metric("Mode", "Real-Time")
-        st.sidebar.metric("Latency", "< 1 second")
+        render_metric_grid(
+            [("Mode", "Real-Time"), ("Latency", "&lt; 1 second")],
+            container=st.sidebar
+        )
     else:
         st.sidebar.warning("Initializing...")
         if st.sidebar.button("🔄 Reconnect WebSocket"):
@@ -176,11 +502,14 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("Scanner Stats")
 
 # Only WebSocket stats (HTTP mode removed)
-st.sidebar.metric("Mode", "WebSocket Streaming")
-st.sidebar.metric("Symbols", "49 NIFTY 50")
-st.sidebar.metric("Updates", "Real-Time (<1s)")
+scanner_stats = [
+    ("Mode", "WebSocket Streaming"),
+    ("Symbols", "49 NIFTY 50"),
+    ("Updates", "Real-Time (&lt;1s)"),
+]
 if st.session_state.signals:
-    st.sidebar.metric("Active Signals", len(st.session_state.signals))
+    scanner_stats.append(("Active Signals", len(st.session_state.signals)))
+render_metric_grid(scanner_stats, container=st.sidebar)
 
 # Auto-trading controls
 st.sidebar.markdown("---")
@@ -196,8 +525,13 @@ if st.session_state.executor:
         st.sidebar.warning("Auto-trading DEACTIVATED")
     
     exec_stats = st.session_state.executor.get_statistics()
-    st.sidebar.metric("Auto-Trade Status", "🟢 ACTIVE" if exec_stats['is_active'] else "🔴 INACTIVE")
-    st.sidebar.metric("Trades Today", f"{exec_stats['trades_today']}/{exec_stats['max_trades_per_day']}")
+    render_metric_grid(
+        [
+            ("Auto-Trade Status", "🟢 ACTIVE" if exec_stats['is_active'] else "🔴 INACTIVE"),
+            ("Trades Today", f"{exec_stats['trades_today']}/{exec_stats['max_trades_per_day']}"),
+        ],
+        container=st.sidebar
+    )
 else:
     st.sidebar.warning("Executor not initialized. Check .env credentials.")
 
@@ -205,171 +539,105 @@ else:
 if st.session_state.last_scan_time:
     st.info(f"Last scan: {st.session_state.last_scan_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
-# Display signals
-if st.session_state.signals:
+# Display signals - as a timed fragment where supported, only this panel
+# re-executes on the 2s refresh beat; the sidebar, CSS and WebSocket init
+# above run only on real full-page reruns
+_signals_panel = (
+    st.fragment(run_every=2.0) if FRAGMENT_AVAILABLE else (lambda func: func)
+)
+
+
+@_signals_panel
+def render_signals_panel():
+    """Signal summary, paginated cards and CSV download (or placeholder)"""
+    # In WebSocket mode the ticker thread accumulates signals in the
+    # streaming scanner; compare its change counter first so quiet ticks
+    # skip the snapshot copy and reuse the list already in session state
+    if (st.session_state.scan_mode == "WebSocket"
+            and st.session_state.streaming_scanner is not None):
+        version = st.session_state.streaming_scanner.signals_version()
+        if version != st.session_state.get('signals_version'):
+            st.session_state.signals = (
+                st.session_state.streaming_scanner.get_signals_snapshot()
+            )
+            st.session_state.signals_version = version
+
+    if not st.session_state.signals:
+        st.info("👆 Click 'Scan All Symbols' to start scanning for signals")
+
+        # Show sample of symbols being monitored (pre-rendered at import)
+        st.subheader("Monitored Symbols")
+        st.markdown(_SYMBOLS_HTML, unsafe_allow_html=True)
+        return
+
     st.header(f"📊 Active Signals ({len(st.session_state.signals)})")
-    
-    # Summary metrics
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    buy_signals = [s for s in st.session_state.signals if s.signal_type.value == 'BUY']
-    sell_signals = [s for s in st.session_state.signals if s.signal_type.value == 'SELL']
-    avg_strength = sum(s.strength for s in st.session_state.signals) / len(st.session_state.signals)
-    
-    # Count signals by quality
-    high_prob_count = 0
-    strong_count = 0
-    valid_count = 0
-    for signal in st.session_state.signals:
-        if signal.reason and '[' in signal.reason:
-            if 'HIGH-PROB' in signal.reason:
-                high_prob_count += 1
-            elif 'STRONG' in signal.reason:
-                strong_count += 1
-            elif 'VALID' in signal.reason:
-                valid_count += 1
-    
-    col1.metric("Total Signals", len(st.session_state.signals))
-    col2.metric("BUY Signals", len(buy_signals), delta_color="normal")
-    col3.metric("SELL Signals", len(sell_signals), delta_color="inverse")
-    col4.metric("Avg Strength", f"{avg_strength:.1%}")
-    col5.metric("HIGH-PROB (5+)", high_prob_count, delta_color="normal")
-    
+
+    # One NumPy pass over the signals instead of three comprehensions -
+    # this block re-executes on every refresh (every 2s in WebSocket mode)
+    signals = st.session_state.signals
+    is_buy = np.fromiter(
+        (s.signal_type.value == 'BUY' for s in signals),
+        dtype=np.bool_, count=len(signals)
+    )
+    strengths = np.fromiter(
+        (s.strength for s in signals),
+        dtype=np.float32, count=len(signals)
+    )
+    buy_count = int(is_buy.sum())
+    sell_count = len(signals) - buy_count
+    avg_strength = float(strengths.mean())
+
+    # Quality count through the memoized reason parser - steady state is
+    # one cached tuple lookup per signal instead of substring scans
+    high_prob_count = int(np.fromiter(
+        (_parse_quality_score(s.reason)[0] == 'HIGH-PROB' for s in signals),
+        dtype=np.bool_, count=len(signals)
+    ).sum())
+
+    # Summary metrics as one HTML grid instead of five widgets
+    render_metric_grid([
+        ("Total Signals", len(signals)),
+        ("BUY Signals", buy_count),
+        ("SELL Signals", sell_count),
+        ("Avg Strength", f"{avg_strength:.1%}"),
+        ("HIGH-PROB (5+)", high_prob_count),
+    ])
+
     st.markdown("---")
-    
-    # Display each signal
-    for idx, signal in enumerate(st.session_state.signals):
-        signal_dict = signal.to_dict()
-        
-        # Signal card
-        card_class = "buy-signal" if signal.signal_type.value == 'BUY' else "sell-signal"
-        
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            # Extract score from reason (format: "BUY [QUALITY SCORE/8]: ...")
-            score_text = ""
-            quality_text = ""
-            if signal.reason and '[' in signal.reason and ']' in signal.reason:
-                try:
-                    # Extract text between brackets: "[HIGH-PROB 5/8]"
-                    bracket_content = signal.reason.split('[')[1].split(']')[0]
-                    # Split into quality and score: "HIGH-PROB 5/8"
-                    parts = bracket_content.rsplit(' ', 1)
-                    if len(parts) == 2:
-                        quality_text = parts[0]  # "HIGH-PROB"
-                        score_text = parts[1]     # "5/8"
-                except:
-                    pass
-            
-            # Title with score badge
-            if score_text:
-                # Color code based on quality
-                if "HIGH-PROB" in quality_text:
-                    badge_color = "#28a745"  # Green
-                elif "STRONG" in quality_text:
-                    badge_color = "#ffc107"  # Yellow
-                else:
-                    badge_color = "#6c757d"  # Gray
-                
-                st.markdown(f"""
-                ### {signal.symbol} - {signal.signal_type.value} 
-                <span style="background-color: {badge_color}; color: white; padding: 4px 12px; border-radius: 12px; font-size: 14px; font-weight: bold; margin-left: 10px;">
-                    {quality_text} {score_text}
-                </span>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"### {signal.symbol} - {signal.signal_type.value}")
-            
-            st.markdown(f"**Price:** ₹{signal.price:.2f} | **Strength:** {signal.strength:.1%}")
-            st.markdown(f"**Time:** {signal.timestamp}")
-            
-            # Expandable detailed explanation
-            with st.expander(f"📖 View Detailed Explanation"):
-                st.markdown(f"```\n{signal.get_detailed_explanation()}\n```")
-            
-            # Conditions met
-            if signal.conditions_met:
-                st.markdown("**Conditions Met:**")
-                for condition in signal.conditions_met:
-                    st.markdown(f"- {condition}")
-        
-        with col2:
-            # Trade setup
-            if signal.stop_loss and signal.take_profit:
-                st.markdown("**Trade Setup:**")
-                st.metric("Entry", f"₹{signal.price:.2f}")
-                st.metric("Stop Loss", f"₹{signal.stop_loss:.2f}")
-                st.metric("Take Profit", f"₹{signal.take_profit:.2f}")
-                
-                rr_ratio = signal.get_risk_reward_ratio()
-                if rr_ratio:
-                    st.metric("R:R Ratio", f"1:{rr_ratio:.2f}")
-            
-            # Execute button
-            if st.session_state.executor:
-                if st.button(f"⚡ Execute Trade", key=f"exec_{idx}"):
-                    with st.spinner("Executing trade..."):
-                        result = st.session_state.executor.execute_signal(signal)
-                        if result:
-                            st.success(f"✅ Order placed! ID: {result.get('order_id', 'N/A')}")
-                        else:
-                            st.error("❌ Failed to place order")
-        
-        st.markdown("---")
-    
-    # Download signals as CSV
-    if st.button("📥 Download Signals as CSV"):
-        df_data = []
-        for signal in st.session_state.signals:
-            # Extract score from reason
-            score_text = ""
-            quality_text = ""
-            if signal.reason and '[' in signal.reason and ']' in signal.reason:
-                try:
-                    bracket_content = signal.reason.split('[')[1].split(']')[0]
-                    parts = bracket_content.rsplit(' ', 1)
-                    if len(parts) == 2:
-                        quality_text = parts[0]
-                        score_text = parts[1]
-                except:
-                    pass
-            
-            df_data.append({
-                'Symbol': signal.symbol,
-                'Signal': signal.signal_type.value,
-                'Quality': quality_text if quality_text else 'N/A',
-                'Score': score_text if score_text else 'N/A',
-                'Price': signal.price,
-                'Strength': signal.strength,
-                'Stop Loss': signal.stop_loss,
-                'Take Profit': signal.take_profit,
-                'R:R Ratio': signal.get_risk_reward_ratio(),
-                'Reason': signal.reason,
-                'Timestamp': signal.timestamp
-            })
-        
-        df = pd.DataFrame(df_data)
-        csv = df.to_csv(index=False)
-        
-        st.download_button(
-            label="Download CSV",
-            data=csv,
-            file_name=f"signals_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
 
-else:
-    st.info("👆 Click 'Scan All Symbols' to start scanning for signals")
-    
-    # Show sample of symbols being monitored
-    symbols = config.get_symbols()
-    st.subheader("Monitored Symbols")
-    
-    # Display in columns
-    cols = st.columns(5)
-    for idx, symbol in enumerate(symbols):
-        cols[idx % 5].markdown(f"- {symbol}")
+    # Display signals paginated - rendering 50 Markdown-heavy cards on
+    # every refresh was the dashboard's dominant UI cost
+    total_signals = len(signals)
+    total_pages = max(1, -(-total_signals // CARDS_PER_PAGE))
+
+    if total_pages > 1:
+        page = st.number_input(
+            "Page", min_value=1, max_value=total_pages, value=1, key="signal_page"
+        )
+    else:
+        page = 1
+
+    page_start = (page - 1) * CARDS_PER_PAGE
+    page_signals = islice(signals, page_start, page_start + CARDS_PER_PAGE)
+    for idx, signal in enumerate(page_signals, start=page_start):
+        render_signal_card(signal, idx)
+
+    # Download signals as CSV (payload built once per signal set - the
+    # cache key is cheap identity tuples, the heavy work happens only
+    # when the signal list actually changes)
+    csv_payload = signals_to_csv(
+        tuple((s.symbol, s.signal_type.value, str(s.timestamp)) for s in signals),
+        signals
+    )
+    st.download_button(
+        label="📥 Download Signals as CSV",
+        data=csv_payload,
+        file_name=f"signals_{NOW.strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv"
+    )
+
+
+render_signals_panel()
 
 # Footer
 st.markdown("---")
@@ -381,15 +649,9 @@ if st.session_state.scan_mode == "WebSocket":
     if st.session_state.websocket_stream is None:
         try:
             # Load instrument tokens
-            if os.path.exists('instrument_tokens.json'):
-                with open('instrument_tokens.json', 'r') as f:
-                    tokens_data = json.load(f)
-                
-                # Get API credentials
-                api_key = os.getenv('ZERODHA_API_KEY')
-                access_token = os.getenv('ZERODHA_ACCESS_TOKEN')
-                
-                if api_key and access_token:
+            tokens_data = load_instrument_tokens()
+            if tokens_data is not None:
+                if ZERODHA_API_KEY and ZERODHA_ACCESS_TOKEN:
                     # tokens_data is already a dict: {'SYMBOL.NS': token_int}
                     symbols = list(tokens_data.keys())
                     
@@ -397,8 +659,8 @@ if st.session_state.scan_mode == "WebSocket":
                     
                     # Create WebSocket stream first
                     stream = RealtimeDataStream(
-                        api_key=api_key,
-                        access_token=access_token
+                        api_key=ZERODHA_API_KEY,
+                        access_token=ZERODHA_ACCESS_TOKEN
                     )
                     
                     # Get strategy from the HTTP scanner
@@ -433,23 +695,51 @@ if st.session_state.scan_mode == "WebSocket":
             st.error(f"❌ WebSocket initialization failed: {str(e)}")
             st.session_state.scan_mode = "HTTP"  # Fall back to HTTP
     
-    # WebSocket is running - just refresh UI periodically
-    if st.session_state.websocket_connected:
-        import time
-        time.sleep(2)  # Refresh UI every 2 seconds
-        st.rerun()
+    # WebSocket is running - with fragment support the signals panel
+    # refreshes itself (run_every); otherwise fall back to whole-page
+    # reruns every 2 seconds
+    if st.session_state.websocket_connected and not FRAGMENT_AVAILABLE:
+        if AUTOREFRESH_AVAILABLE:
+            st_autorefresh(interval=2000, key="ws_refresh")
+        else:
+            time.sleep(2)
+            st.rerun()
 
-# HTTP auto-scan logic REMOVED - WebSocket only now
-# Old HTTP polling auto-refresh code (commented out):
-# elif auto_scan:
-#     # Check if enough time has passed since last scan
-#     should_scan = False
-#     if st.session_state.last_scan_time is None:
-#         should_scan = True
-#     else:
-#         time_since_scan = (datetime.now() - st.session_state.last_scan_time).total_seconds()
-#         should_scan = time_since_scan >= 60  # 60 seconds interval
-#     if should_scan:
-#         # Automatically trigger scan
-#         ...
-# WebSocket mode handles everything automatically - no manual refresh needed
+# HTTP auto-scan fallback (reached when WebSocket init fails): adaptive
+# jittered polling instead of a fixed 60s beat
+elif st.session_state.scan_mode == "HTTP":
+    should_scan = st.session_state.last_scan_time is None
+    if not should_scan:
+        elapsed = (NOW - st.session_state.last_scan_time).total_seconds()
+        jittered = st.session_state.poll_interval * (1 + random.uniform(-0.2, 0.2))
+        should_scan = elapsed >= jittered
+
+    if should_scan:
+        with st.spinner("Scanning all NIFTY 50 stocks..."):
+            signals = st.session_state.scanner.scan_all_symbols()
+
+        # Shrink the interval when signal flow picks up, back off when
+        # scans come up empty
+        if len(signals) > st.session_state.previous_signal_count:
+            st.session_state.poll_interval = max(
+                POLL_INTERVAL_MIN, st.session_state.poll_interval / 2
+            )
+        else:
+            st.session_state.poll_interval = min(
+                POLL_INTERVAL_MAX, st.session_state.poll_interval * 1.5
+            )
+
+        st.session_state.previous_signal_count = len(signals)
+        st.session_state.signals = signals
+        # Anchor the interval to scan start, not completion, so slow
+        # scans don't stretch the effective polling period
+        st.session_state.last_scan_time = NOW
+        st.rerun()
+    else:
+        # Re-check periodically until the (jittered) interval elapses
+        recheck_seconds = min(2.0, st.session_state.poll_interval / 4)
+        if AUTOREFRESH_AVAILABLE:
+            st_autorefresh(interval=int(recheck_seconds * 1000), key="http_refresh")
+        else:
+            time.sleep(recheck_seconds)
+            st.rerun()
@@ -3,21 +3,43 @@ Data Fetcher
 Fetches real-time and historical market data from Zerodha
 """
 
+import os
+import threading
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List
-import pytz
-import os
-from dotenv import load_dotenv
+from pathlib import Path
+from typing import Dict, Optional, List
 
+from src.utils.creds import try_get_creds
 from src.utils.logger import get_logger
 from src.utils.config import config
 
-# Load environment variables
-load_dotenv()
-
 logger = get_logger('data_fetcher', config.get('logging'))
 
+# On-disk bar cache: one parquet file per (symbol, interval) holding every
+# bar seen so far, so repeat fetches only pull the delta since the last
+# cached bar instead of the full lookback window. KITE_CACHE_MODE controls
+# the policy: enabled (default), read_only (use but never write), replay
+# (serve from cache only, zero API calls), disabled (always fetch).
+_BAR_CACHE_DIR = Path('_bar_cache')
+
+_INTERVAL_MINUTES = {
+    'minute': 1,
+    '3minute': 3,
+    '5minute': 5,
+    '15minute': 15,
+    '30minute': 30,
+    '60minute': 60,
+    'day': 1440
+}
+
+
+def _bar_cache_mode() -> str:
+    """Get the bar-cache policy from the KITE_CACHE_MODE env var"""
+    return os.getenv('KITE_CACHE_MODE', 'enabled').lower()
+
 # Import Zerodha broker
 try:
     from src.brokers.zerodha_broker import ZerodhaBroker
@@ -27,34 +49,121 @@ except ImportError:
     logger.warning("Zerodha broker not available")
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket pacing calls to a rate-limited API
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so
+    short bursts up to the capacity go through immediately while the
+    sustained rate stays under Kite's limit instead of tripping 429s.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket (starts full)
+
+        Args:
+            rate: Token refill rate in tokens per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1):
+        """
+        Block until n tokens are available, then consume them
+
+        Args:
+            n: Number of tokens (API calls) to consume
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    float(self.capacity),
+                    self.tokens + (now - self.last) * self.rate
+                )
+                self.last = now
+
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+
+                wait = (n - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+# One bucket per Kite endpoint class, shared process-wide (all fetchers
+# reuse one broker session, so the limits are per process, not per
+# instance): historical data allows 3 req/s, quotes 10 req/s
+_HIST_BUCKET = TokenBucket(rate=3.0, capacity=3)
+_QUOTE_BUCKET = TokenBucket(rate=10.0, capacity=10)
+
+
+# Module-level broker shared by every DataFetcher in this process, so the
+# bot, dashboard, and scanner components all reuse one pooled HTTPS session
+# instead of paying a TLS handshake per re-instantiation
+_shared_broker = None
+
+
+def _get_shared_broker() -> Optional["ZerodhaBroker"]:
+    """Get (creating once per process) the shared Zerodha broker"""
+    global _shared_broker
+
+    if _shared_broker is None:
+        creds = try_get_creds()
+        if creds is None:
+            return None
+
+        _shared_broker = ZerodhaBroker(creds.api_key, creds.api_secret, creds.access_token)
+
+    return _shared_broker
+
+
 class DataFetcher:
     """Fetch market data from Zerodha"""
-    
+
     def __init__(self, provider: str = "zerodha"):
         """
         Initialize data fetcher with Zerodha
-        
+
         Args:
             provider: Data provider (zerodha)
         """
         self.provider = provider
         self.data_config = config.get_data_config()
-        
+
+        # Market-hours values are fixed config, so parse them once here
+        # instead of rebuilding the pytz timezone and running strptime
+        # twice on every is_market_open call in the scan loop. pytz is
+        # imported here rather than at module load so scripts that never
+        # construct a DataFetcher skip its tz-database scan at startup.
+        import pytz
+
+        trading_config = config.get_trading_config()
+        self._market_tz = pytz.timezone(
+            trading_config.get('timezone', 'America/New_York'))
+        self._market_open = datetime.strptime(
+            trading_config.get('market_open', '09:30'), '%H:%M').time()
+        self._market_close = datetime.strptime(
+            trading_config.get('market_close', '16:00'), '%H:%M').time()
+
         # Initialize Zerodha connection
         if provider == "zerodha" and ZERODHA_AVAILABLE:
-            api_key = os.getenv('ZERODHA_API_KEY')
-            api_secret = os.getenv('ZERODHA_API_SECRET')
-            access_token = os.getenv('ZERODHA_ACCESS_TOKEN')
-            
-            if api_key and access_token:
-                try:
-                    self.broker = ZerodhaBroker(api_key, api_secret, access_token)
-                    logger.info("Initialized DataFetcher with Zerodha API")
-                except Exception as e:
-                    logger.error(f"Failed to initialize Zerodha: {e}")
-                    logger.info("Falling back to paper trading mode")
-                    from src.brokers.zerodha_broker import MockZerodhaBroker
-                    self.broker = MockZerodhaBroker()
+            broker = None
+            try:
+                broker = _get_shared_broker()
+            except Exception as e:
+                logger.error(f"Failed to initialize Zerodha: {e}")
+                logger.info("Falling back to paper trading mode")
+
+            if broker is not None:
+                self.broker = broker
+                logger.info("Initialized DataFetcher with Zerodha API")
             else:
                 logger.warning("Zerodha credentials not found, using mock broker")
                 from src.brokers.zerodha_broker import MockZerodhaBroker
@@ -93,40 +202,128 @@ class DataFetcher:
             logger.error(f"Error fetching data for {symbol}: {str(e)}", exc_info=True)
             return pd.DataFrame()
     
+    def get_historical_data_batch(
+        self,
+        symbols: List[str],
+        interval: str = "5min",
+        days: int = 5
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch historical data for many symbols in parallel
+
+        The work is network-bound (one Kite HTTP request per symbol), so a
+        small thread pool overlaps the round trips while the shared
+        _HIST_BUCKET inside each fetch keeps the outbound rate at the
+        historical-API limit (3 req/s).
+
+        Args:
+            symbols: Stock symbols to fetch
+            interval: Data interval (see get_historical_data)
+            days: Number of days to fetch
+
+        Returns:
+            Dict mapping symbol to its DataFrame (empty frames on failure)
+        """
+        def fetch(sym: str) -> pd.DataFrame:
+            return self.get_historical_data(sym, interval, days)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            frames = list(executor.map(fetch, symbols))
+        return dict(zip(symbols, frames))
+
     def _fetch_zerodha(
         self,
         symbol: str,
         interval: str,
         days: int
     ) -> pd.DataFrame:
-        """Fetch data using Zerodha Kite API"""
+        """Fetch data using Zerodha Kite API (delta-cached on disk)"""
         try:
             # Calculate date range
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
-            
-            # Fetch data from Zerodha
-            df = self.broker.get_historical_data(
-                instrument_token=symbol,
-                from_date=start_date,
-                to_date=end_date,
-                interval=interval
-            )
-            
+
+            mode = _bar_cache_mode()
+            cache_path = _BAR_CACHE_DIR / f"{symbol.replace('.NS', '')}_{interval}.parquet"
+
+            cached = None
+            if mode != 'disabled' and cache_path.exists():
+                try:
+                    cached = pd.read_parquet(cache_path)
+                except Exception as e:
+                    logger.warning(f"Could not read bar cache for {symbol}: {e}")
+
+            if mode == 'replay':
+                # Serve purely from cache - no API traffic at all
+                if cached is None or cached.empty:
+                    logger.warning(f"No cached bars for {symbol} in replay mode")
+                    return pd.DataFrame()
+                return self._slice_from(cached, start_date)
+
+            if cached is not None and not cached.empty:
+                last_ts = cached.index.max()
+                now_ts = pd.Timestamp.now(tz=last_ts.tz)
+                freshness = timedelta(minutes=_INTERVAL_MINUTES.get(interval, 5))
+
+                if now_ts - last_ts < freshness:
+                    # Newest cached bar is still current - skip the API
+                    return self._slice_from(cached, start_date)
+
+                # Refetch from the last cached bar (it may have been
+                # partial when cached) and splice the delta on
+                _HIST_BUCKET.acquire()
+                fetched = self.broker.get_historical_data(
+                    instrument_token=symbol,
+                    from_date=last_ts.to_pydatetime(),
+                    to_date=end_date,
+                    interval=interval
+                )
+
+                if not fetched.empty:
+                    df = pd.concat([cached, fetched])
+                    df = df[~df.index.duplicated(keep='last')].sort_index()
+                else:
+                    df = cached
+            else:
+                # Cold cache - fetch the full window
+                _HIST_BUCKET.acquire()
+                df = self.broker.get_historical_data(
+                    instrument_token=symbol,
+                    from_date=start_date,
+                    to_date=end_date,
+                    interval=interval
+                )
+
             if df.empty:
                 logger.warning(f"No data returned for {symbol}")
                 return df
-            
+
+            if mode == 'enabled':
+                try:
+                    _BAR_CACHE_DIR.mkdir(exist_ok=True)
+                    df.to_parquet(cache_path, compression='zstd')
+                except Exception as e:
+                    logger.warning(f"Could not write bar cache for {symbol}: {e}")
+
             # Data is already in correct format from broker
             # Index is already datetime
             # Columns are: open, high, low, close, volume
-            
-            logger.info(f"Fetched {len(df)} rows for {symbol}")
-            return df
-            
+
+            result = self._slice_from(df, start_date)
+            logger.info(f"Fetched {len(result)} rows for {symbol}")
+            return result
+
         except Exception as e:
             logger.error(f"Error fetching Zerodha data for {symbol}: {str(e)}")
             return pd.DataFrame()
+
+    @staticmethod
+    def _slice_from(df: pd.DataFrame, start_date: datetime) -> pd.DataFrame:
+        """Return the rows at or after start_date (tz-safe)"""
+        start = pd.Timestamp(start_date)
+        if df.index.tz is not None and start.tz is None:
+            start = start.tz_localize(df.index.tz)
+        return df[df.index >= start]
     
     def get_real_time_quote(self, symbol: str) -> dict:
         """
@@ -139,51 +336,72 @@ class DataFetcher:
             Dictionary with current price, volume, etc.
         """
         try:
-            # Get quote from Zerodha
+            # Get quote from Zerodha (paced to the quote endpoint limit)
+            _QUOTE_BUCKET.acquire()
             quote_data = self.broker.get_quote(symbol)
             
             if not quote_data:
                 logger.warning(f"No quote data for {symbol}")
                 return {}
-            
-            # Extract relevant fields from Zerodha quote
-            ohlc = quote_data.get('ohlc', {})
-            quote = {
-                'symbol': symbol,
-                'price': quote_data.get('last_price', 0),
-                'open': ohlc.get('open', 0),
-                'high': ohlc.get('high', 0),
-                'low': ohlc.get('low', 0),
-                'close': ohlc.get('close', 0),
-                'change': quote_data.get('change', 0),
-                'change_percent': quote_data.get('change_percent', 0),
-                'volume': quote_data.get('volume', 0),
-                'timestamp': datetime.now()
-            }
-            
-            return quote
-            
+
+            return self._normalize_quote(symbol, quote_data)
+
         except Exception as e:
             logger.error(f"Error fetching quote for {symbol}: {str(e)}")
             return {}
-    
+
+    @staticmethod
+    def _normalize_quote(symbol: str, quote_data: dict) -> dict:
+        """Extract the relevant fields from a raw Zerodha quote"""
+        ohlc = quote_data.get('ohlc', {})
+        return {
+            'symbol': symbol,
+            'price': quote_data.get('last_price', 0),
+            'open': ohlc.get('open', 0),
+            'high': ohlc.get('high', 0),
+            'low': ohlc.get('low', 0),
+            'close': ohlc.get('close', 0),
+            'change': quote_data.get('change', 0),
+            'change_percent': quote_data.get('change_percent', 0),
+            'volume': quote_data.get('volume', 0),
+            'timestamp': datetime.now()
+        }
+
+    def get_quotes_bulk(self, symbols: List[str]) -> dict:
+        """
+        Get real-time quotes for many symbols with one API call
+
+        Args:
+            symbols: List of stock symbols
+
+        Returns:
+            Dict mapping symbol to its normalized quote (empty on failure)
+        """
+        try:
+            _QUOTE_BUCKET.acquire()
+            raw_quotes = self.broker.get_quotes(symbols)
+        except Exception as e:
+            logger.error(f"Error fetching bulk quotes: {str(e)}")
+            return {}
+
+        return {
+            symbol: self._normalize_quote(symbol, data)
+            for symbol, data in raw_quotes.items()
+        }
+
+
     def get_multiple_quotes(self, symbols: List[str]) -> pd.DataFrame:
         """
-        Get quotes for multiple symbols
-        
+        Get quotes for multiple symbols with one API round trip
+
         Args:
             symbols: List of stock symbols
-            
+
         Returns:
             DataFrame with quotes for all symbols
         """
-        quotes = []
-        for symbol in symbols:
-            quote = self.get_real_time_quote(symbol)
-            if quote:
-                quotes.append(quote)
-        
-        return pd.DataFrame(quotes)
+        quotes = self.get_quotes_bulk(symbols)
+        return pd.DataFrame.from_records(list(quotes.values()))
     
     def is_market_open(self) -> bool:
         """
@@ -192,20 +410,8 @@ class DataFetcher:
         Returns:
             True if market is open, False otherwise
         """
-        trading_config = config.get_trading_config()
-        timezone = pytz.timezone(trading_config.get('timezone', 'America/New_York'))
-        
-        now = datetime.now(timezone)
-        current_time = now.time()
-        
-        # Get market hours
-        market_open = datetime.strptime(trading_config.get('market_open', '09:30'), '%H:%M').time()
-        market_close = datetime.strptime(trading_config.get('market_close', '16:00'), '%H:%M').time()
-        
-        # Check if it's a weekday
-        is_weekday = now.weekday() < 5
-        
-        # Check if current time is within market hours
-        is_open = is_weekday and market_open <= current_time <= market_close
-        
-        return is_open
+        now = datetime.now(self._market_tz)
+        return (
+            now.weekday() < 5
+            and self._market_open <= now.time() <= self._market_close
+        )
@@ -33,18 +33,23 @@ class DataProcessor:
         if df.empty:
             return df
         
-        df = df.copy()
-        
-        # Remove duplicates
-        df.drop_duplicates(inplace=True)
-        
-        # Handle missing values
-        df.fillna(method='ffill', inplace=True)
-        df.fillna(method='bfill', inplace=True)
-        
-        # Remove rows with any remaining NaN values
-        df.dropna(inplace=True)
-        
+        # Chained expression instead of copy + four inplace passes: each
+        # step already returns a new frame, so the upfront df.copy() was
+        # a redundant full-table allocation. ffill/bfill are the modern
+        # spelling of the deprecated fillna(method=) calls.
+        df = df.drop_duplicates().ffill().bfill().dropna()
+
+        # Downcast to float32: rupee prices fit easily in its 24-bit
+        # mantissa, and halving the element size halves the memory
+        # bandwidth of every downstream indicator/plotting pass
+        float_cols = df.select_dtypes('float64').columns
+        if len(float_cols) > 0:
+            df[float_cols] = df[float_cols].astype('float32')
+
+        if 'volume' in df.columns and df['volume'].dtype == 'int64':
+            if df['volume'].max() < np.iinfo(np.int32).max:
+                df['volume'] = df['volume'].astype('int32')
+
         logger.info(f"Cleaned data: {len(df)} rows remaining")
         return df
     
@@ -62,13 +67,21 @@ class DataProcessor:
             return df
         
         df = df.copy()
-        
-        # Simple returns
-        df['returns'] = df['close'].pct_change()
-        
-        # Log returns
-        df['log_returns'] = np.log(df['close'] / df['close'].shift(1))
-        
+
+        # One pass over close: pct_change plus a separate shift/divide/
+        # log ran two shifts and materialized three intermediates. Since
+        # log_returns == log1p(returns) exactly, compute returns with a
+        # single strided divide and derive log returns from it. float32
+        # matches the downcast OHLCV columns.
+        close = df['close'].to_numpy()
+        returns = np.empty(len(close), dtype=np.float32)
+        returns[0] = np.nan
+        np.divide(close[1:], close[:-1], out=returns[1:])
+        returns[1:] -= 1.0
+
+        df['returns'] = returns
+        df['log_returns'] = np.log1p(returns)
+
         return df
     
     def add_volume_profile(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -85,16 +98,28 @@ class DataProcessor:
             return df
         
         df = df.copy()
-        
-        # Volume moving average
-        df['volume_ma_20'] = df['volume'].rolling(window=20).mean()
-        
-        # Relative volume
-        df['relative_volume'] = df['volume'] / df['volume_ma_20']
-        
-        # Volume trend
-        df['volume_trend'] = df['volume'].rolling(window=5).mean() / df['volume'].rolling(window=20).mean()
-        
+
+        # Both rolling means from one cumulative sum: the old code ran
+        # three separate rolling scans (the 20-bar mean twice). Sums are
+        # accumulated in float64 so long histories keep full precision.
+        vol = df['volume'].to_numpy(dtype=np.float64)
+        padded_cumsum = np.concatenate(([0.0], np.cumsum(vol)))
+
+        def _move_mean(window: int) -> np.ndarray:
+            out = np.full(len(vol), np.nan)
+            if len(vol) >= window:
+                out[window - 1:] = (
+                    padded_cumsum[window:] - padded_cumsum[:-window]
+                ) / window
+            return out
+
+        ma_5 = _move_mean(5)
+        ma_20 = _move_mean(20)
+
+        df['volume_ma_20'] = ma_20
+        df['relative_volume'] = vol / ma_20
+        df['volume_trend'] = ma_5 / ma_20
+
         return df
     
     def add_price_levels(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -140,29 +165,26 @@ class DataProcessor:
         """
         if df.empty:
             return df
-        
-        df = df.copy()
-        
-        # Ensure we have a datetime column
-        if 'datetime' not in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df.index):
-                df['datetime'] = df.index
-            else:
-                return df
-        
-        # Convert to datetime if needed
-        df['datetime'] = pd.to_datetime(df['datetime'])
-        
-        # Extract time
-        df['time'] = df['datetime'].dt.time
-        
-        # Filter by time range
-        start = pd.to_datetime(start_time, format='%H:%M').time()
-        end = pd.to_datetime(end_time, format='%H:%M').time()
-        
-        df = df[(df['time'] >= start) & (df['time'] <= end)]
-        df.drop('time', axis=1, inplace=True)
-        
+
+        # Find the timestamps without mutating the caller's frame
+        if 'datetime' in df.columns:
+            timestamps = pd.DatetimeIndex(pd.to_datetime(df['datetime']))
+        elif pd.api.types.is_datetime64_any_dtype(df.index):
+            timestamps = df.index
+        else:
+            return df
+
+        # Compare minutes-since-midnight as vectorized int64 instead of
+        # building an object column of datetime.time and comparing
+        # Python objects row by row
+        minutes = timestamps.hour * 60 + timestamps.minute
+
+        start_h, start_m = map(int, start_time.split(':'))
+        end_h, end_m = map(int, end_time.split(':'))
+
+        mask = (minutes >= start_h * 60 + start_m) & (minutes <= end_h * 60 + end_m)
+        df = df.loc[mask]
+
         logger.info(f"Filtered data by time: {len(df)} rows remaining")
         return df
     
@@ -184,20 +206,21 @@ class DataProcessor:
         if df.empty:
             return df
         
-        df = df.copy()
-        
-        # Set datetime as index
+        # Set datetime as index (set_index returns a new frame, so the
+        # caller's input is untouched without an upfront copy)
         if 'datetime' in df.columns:
-            df.set_index('datetime', inplace=True)
-        
-        # Resample OHLCV data
-        resampled = pd.DataFrame()
-        resampled['open'] = df['open'].resample(timeframe).first()
-        resampled['high'] = df['high'].resample(timeframe).max()
-        resampled['low'] = df['low'].resample(timeframe).min()
-        resampled['close'] = df['close'].resample(timeframe).last()
-        resampled['volume'] = df['volume'].resample(timeframe).sum()
-        
+            df = df.set_index('datetime')
+
+        # One resample pass computing all five aggregates instead of
+        # re-binning the index per column
+        resampled = df.resample(timeframe).agg({
+            'open': 'first',
+            'high': 'max',
+            'low': 'min',
+            'close': 'last',
+            'volume': 'sum'
+        })
+
         resampled.reset_index(inplace=True)
         
         logger.info(f"Resampled data to {timeframe}: {len(resampled)} rows")
@@ -3,11 +3,13 @@ Real-time WebSocket Data Stream using Zerodha KiteTicker
 Provides live tick-by-tick data without rate limits
 """
 
+import struct
 import time
 import threading
 from typing import Dict, List, Callable, Optional
 from datetime import datetime
 from collections import deque
+import numpy as np
 import pandas as pd
 
 from src.utils.logger import get_logger
@@ -15,6 +17,16 @@ from src.utils.config import config
 
 logger = get_logger('realtime_stream', config.get('logging'))
 
+# Precompiled decoders for Kite's binary tick frames. A frame is a
+# big-endian packet count (2 bytes), then per packet a 2-byte length
+# followed by the packet itself: 8 bytes = LTP mode, 44 = quote mode,
+# 184 = full mode; the first 8 bytes of every packet are (token, ltp)
+# and the cumulative volume sits at packet offset 16 in quote/full mode.
+_FRAME_HEADER = struct.Struct(">H")
+_TOKEN_LTP = struct.Struct(">ii")
+_VOLUME = struct.Struct(">i")
+_VOLUME_OFFSET = 16
+
 try:
     from kiteconnect import KiteTicker
     TICKER_AVAILABLE = True
@@ -57,15 +69,28 @@ class RealtimeDataStream:
         
         # Callbacks
         self.tick_callbacks: List[Callable] = []
+        self.tick_batch_callbacks: List[Callable] = []
         self.error_callbacks: List[Callable] = []
         
         # Connection state
         self.is_connected = False
         self.subscribed_tokens: List[int] = []
         
-        # Symbol to token mapping (cache)
+        # Symbol to token mapping (cache) plus the reverse map so
+        # on_ticks resolves each tick's symbol with one hash lookup
+        # instead of scanning every subscription
         self.symbol_to_token: Dict[str, int] = {}
-        
+        self.token_to_symbol: Dict[int, str] = {}
+
+        # SoA columns for the raw binary fast path: one float32 LTP slot
+        # and one uint32 volume slot per subscribed token, written in
+        # place by _decode_frame so the per-tick hot path allocates
+        # nothing (the SDK's dict-based on_ticks path stays as-is for
+        # the callback consumers)
+        self._token_index: Dict[int, int] = {}
+        self._ltp_arr = np.zeros(0, dtype=np.float32)
+        self._vol_arr = np.zeros(0, dtype=np.uint32)
+
         # Setup callbacks
         self._setup_callbacks()
         
@@ -76,38 +101,52 @@ class RealtimeDataStream:
         
         def on_ticks(ws, ticks):
             """Called when ticks are received"""
+            # KiteTicker already delivers ticks in frames; collect the
+            # resolved (symbol, tick) pairs so batch consumers and the
+            # log line run once per frame, not once per tick
+            batch = []
+
             for tick in ticks:
                 instrument_token = tick.get('instrument_token')
-                
-                # Find symbol for this token
-                symbol = None
-                for sym, token in self.symbol_to_token.items():
-                    if token == instrument_token:
-                        symbol = sym
-                        break
-                
+
+                # O(1) reverse-map lookup instead of scanning every
+                # subscribed symbol per tick
+                symbol = self.token_to_symbol.get(instrument_token)
+
                 if symbol:
                     # Initialize deque if needed
                     if symbol not in self.tick_data:
                         self.tick_data[symbol] = deque(maxlen=100)
-                    
+
                     # Store tick with timestamp
                     tick['timestamp'] = datetime.now()
                     self.tick_data[symbol].append(tick)
                     self.latest_tick[symbol] = tick
-                    
-                    # Log tick received (helps verify streaming is working)
+
                     last_price = tick.get('last_price', 0)
                     # KiteTicker provides 'volume_traded' not 'volume'
                     volume = tick.get('volume_traded', tick.get('volume', 0))
-                    logger.info(f"TICK: {symbol} | Rs.{last_price:.2f} | Vol: {volume:,}")
-                    
-                    # Call registered callbacks
+                    logger.debug(f"TICK: {symbol} | Rs.{last_price:.2f} | Vol: {volume:,}")
+
+                    batch.append((symbol, tick))
+
+                    # Call registered per-tick callbacks
                     for callback in self.tick_callbacks:
                         try:
                             callback(symbol, tick)
                         except Exception as e:
                             logger.error(f"Error in tick callback: {e}")
+
+            if batch:
+                # One aggregated line per frame keeps the "streaming is
+                # alive" signal without flooding the log under bursts
+                logger.info(f"TICK BATCH: {len(batch)} ticks")
+
+                for callback in self.tick_batch_callbacks:
+                    try:
+                        callback(batch)
+                    except Exception as e:
+                        logger.error(f"Error in tick batch callback: {e}")
         
         def on_connect(ws, response):
             """Called when WebSocket connects"""
@@ -133,12 +172,48 @@ class RealtimeDataStream:
                     callback(code, reason)
                 except Exception as e:
                     logger.error(f"Error in error callback: {e}")
-        
+
+        def on_message(ws, payload, is_binary):
+            """Raw frame hook - decode straight into the SoA columns"""
+            if is_binary and len(payload) > 4:
+                try:
+                    self._decode_frame(payload)
+                except Exception as e:
+                    logger.error(f"Error decoding binary frame: {e}")
+
         # Assign callbacks
         self.kws.on_ticks = on_ticks
         self.kws.on_connect = on_connect
         self.kws.on_close = on_close
         self.kws.on_error = on_error
+        self.kws.on_message = on_message
+
+    def _decode_frame(self, payload: bytes):
+        """
+        Decode one binary tick frame into the preallocated SoA columns
+
+        unpack_from with the precompiled Structs reads the (token, ltp)
+        header and volume field in place - no per-tick dict, Decimal or
+        datetime allocations on this path.
+        """
+        count = _FRAME_HEADER.unpack_from(payload, 0)[0]
+        offset = 2
+
+        for _ in range(count):
+            packet_len = _FRAME_HEADER.unpack_from(payload, offset)[0]
+            offset += 2
+
+            token, ltp_paise = _TOKEN_LTP.unpack_from(payload, offset)
+            idx = self._token_index.get(token)
+            if idx is not None:
+                # Equity prices arrive in paise
+                self._ltp_arr[idx] = ltp_paise / 100.0
+                if packet_len >= _VOLUME_OFFSET + 4:
+                    self._vol_arr[idx] = _VOLUME.unpack_from(
+                        payload, offset + _VOLUME_OFFSET
+                    )[0]
+
+            offset += packet_len
     
     def subscribe(self, symbols: List[str], instrument_tokens: Dict[str, int]):
         """
@@ -148,8 +223,10 @@ class RealtimeDataStream:
             symbols: List of symbols (e.g., ['RELIANCE.NS', 'TCS.NS'])
             instrument_tokens: Dict mapping symbols to instrument tokens
         """
-        # Update symbol-token mapping
+        # Update symbol-token mapping (both directions)
         self.symbol_to_token.update(instrument_tokens)
+        self.token_to_symbol.update(
+            {token: sym for sym, token in instrument_tokens.items()})
         
         # Get tokens to subscribe
         tokens = [instrument_tokens[sym] for sym in symbols if sym in instrument_tokens]
@@ -161,7 +238,14 @@ class RealtimeDataStream:
         # Subscribe to tokens
         self.subscribed_tokens.extend(tokens)
         self.subscribed_tokens = list(set(self.subscribed_tokens))  # Remove duplicates
-        
+
+        # (Re)allocate the SoA tick columns, one slot per token
+        self._token_index = {
+            token: idx for idx, token in enumerate(self.subscribed_tokens)
+        }
+        self._ltp_arr = np.zeros(len(self.subscribed_tokens), dtype=np.float32)
+        self._vol_arr = np.zeros(len(self.subscribed_tokens), dtype=np.uint32)
+
         if self.is_connected:
             self.kws.subscribe(tokens)
             # Set mode to FULL for complete tick data
@@ -179,6 +263,7 @@ class RealtimeDataStream:
             for token in tokens:
                 if token in self.subscribed_tokens:
                     self.subscribed_tokens.remove(token)
+                self.token_to_symbol.pop(token, None)
             logger.info(f"Unsubscribed from {len(tokens)} symbols")
     
     def start(self):
@@ -220,6 +305,16 @@ class RealtimeDataStream:
     def register_tick_callback(self, callback: Callable):
         """Register callback for tick updates: callback(symbol, tick)"""
         self.tick_callbacks.append(callback)
+
+    def register_tick_batch_callback(self, callback: Callable):
+        """
+        Register a per-frame callback: callback([(symbol, tick), ...])
+
+        Invoked once per websocket frame with all resolved ticks, so
+        consumers amortize their work across the batch instead of
+        paying one Python call per tick.
+        """
+        self.tick_batch_callbacks.append(callback)
     
     def register_error_callback(self, callback: Callable):
         """Register callback for errors: callback(code, reason)"""
@@ -264,7 +359,13 @@ class RealtimeDataStream:
         return candle
     
     def get_current_price(self, symbol: str) -> Optional[float]:
-        """Get current price for symbol"""
+        """Get current price for symbol (SoA fast path, tick fallback)"""
+        token = self.symbol_to_token.get(symbol)
+        if token is not None:
+            idx = self._token_index.get(token)
+            if idx is not None and self._ltp_arr[idx] > 0:
+                return float(self._ltp_arr[idx])
+
         tick = self.get_latest_tick(symbol)
         if tick:
             return tick.get('last_price')
@@ -299,19 +400,66 @@ class StreamingScanner:
         self.stream = stream
         self.strategy = strategy
         self.alert_manager = alert_manager
-        
+
         # Signal tracking
         self.active_signals: Dict[str, Dict] = {}
         self.last_check: Dict[str, datetime] = {}
-        
-        # Register callback for tick updates
-        self.stream.register_tick_callback(self._on_tick_update)
-        
+
+        # Detected signals, written by the KiteTicker thread and read by
+        # the UI. Bounded ring buffer + lock so the dashboard takes a
+        # cheap copy-snapshot instead of sharing mutable state with the
+        # parser thread.
+        self._signals: deque = deque(maxlen=200)
+        self._signals_lock = threading.Lock()
+        # Bumped on every append; readers compare it against their last
+        # seen value to skip the snapshot copy when nothing changed
+        self._signals_version = 0
+
+        # Register for whole frames: a burst of ticks for one symbol
+        # collapses to a single signal check instead of one per tick
+        self.stream.register_tick_batch_callback(self._on_tick_batch)
+
         logger.info("Initialized StreamingScanner")
-    
+
+    def add_signal(self, signal):
+        """Push a detected signal (called from the ticker thread)"""
+        with self._signals_lock:
+            self._signals.append(signal)
+            self._signals_version += 1
+
+        if self.alert_manager:
+            try:
+                self.alert_manager.queue_signals([signal])
+            except Exception as e:
+                logger.error(f"Error queuing signal alert: {e}")
+
+    def get_signals_snapshot(self) -> List:
+        """
+        Copy-snapshot the detected signals for UI rendering
+
+        Returns:
+            List of signals, newest last
+        """
+        with self._signals_lock:
+            return list(self._signals)
+
+    def signals_version(self) -> int:
+        """Change counter for the signal ring (integer read, no copy)"""
+        return self._signals_version
+
+
+    def _on_tick_batch(self, batch: List):
+        """Called once per websocket frame with all (symbol, tick) pairs"""
+        # Dedupe by symbol, keeping the newest tick: only the latest
+        # price matters for a signal check, so a burst frame costs one
+        # check per symbol rather than one per tick
+        latest = dict(batch)
+        for symbol, tick in latest.items():
+            self._on_tick_update(symbol, tick)
+
     def _on_tick_update(self, symbol: str, tick: Dict):
-        """Called on every tick - check for signals"""
-        
+        """Check one symbol for signals (throttled per symbol)"""
+
         # Throttle checks (don't check every single tick)
         now = datetime.now()
         if symbol in self.last_check:
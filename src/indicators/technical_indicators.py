@@ -10,12 +10,88 @@ from typing import Tuple
 from src.utils.logger import get_logger
 from src.utils.config import config
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = get_logger('technical_indicators', config.get('logging'))
 
 
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def _ema_kernel(values: np.ndarray, span: int) -> np.ndarray:
+        """EMA recurrence over a float64 array (matches ewm(adjust=False))"""
+        n = len(values)
+        out = np.empty(n, dtype=np.float64)
+        if n == 0:
+            return out
+
+        alpha = 2.0 / (span + 1.0)
+        out[0] = values[0]
+        for i in range(1, n):
+            out[i] = alpha * values[i] + (1.0 - alpha) * out[i - 1]
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _rsi_kernel(close: np.ndarray, period: int) -> np.ndarray:
+        """RSI from rolling mean gain/loss (matches the pandas formula)"""
+        n = len(close)
+        out = np.full(n, np.nan, dtype=np.float64)
+        if n < period:
+            return out
+
+        # Bar 0 has no diff; where() in the pandas path maps it to a zero
+        # gain/loss, so it still counts toward the first rolling window
+        gain = np.zeros(n, dtype=np.float64)
+        loss = np.zeros(n, dtype=np.float64)
+        for i in range(1, n):
+            delta = close[i] - close[i - 1]
+            if delta > 0.0:
+                gain[i] = delta
+            elif delta < 0.0:
+                loss[i] = -delta
+
+        # Sliding-window sums instead of re-summing the window per bar
+        gain_sum = 0.0
+        loss_sum = 0.0
+        for i in range(period):
+            gain_sum += gain[i]
+            loss_sum += loss[i]
+
+        for i in range(period - 1, n):
+            if i >= period:
+                gain_sum += gain[i] - gain[i - period]
+                loss_sum += loss[i] - loss[i - period]
+
+            if loss_sum > 0.0:
+                rs = gain_sum / loss_sum
+                out[i] = 100.0 - 100.0 / (1.0 + rs)
+            elif gain_sum > 0.0:
+                out[i] = 100.0
+            # gain_sum == loss_sum == 0 stays NaN (0/0 in the pandas path)
+
+        return out
+
+    # Trigger the JIT on tiny arrays at import so the one-off compile cost
+    # (cached on disk afterwards) is paid at startup, not on the first
+    # trading cycle during market hours
+    _warmup = np.arange(16, dtype=np.float64)
+    _ema_kernel(_warmup, 12)
+    _rsi_kernel(_warmup, 14)
+    del _warmup
+
+
 class TechnicalIndicators:
     """Calculate technical indicators"""
-    
+
+    # Bars of history an incremental update recomputes over. Rolling
+    # indicators need at most ~50 bars; the extra cushion makes the seeded
+    # EMAs (span 50 max) agree with a full recompute to float precision.
+    INCREMENTAL_LOOKBACK = 400
+
     def __init__(self):
         """Initialize technical indicators calculator"""
         self.strategy_config = config.get_strategy_config()
@@ -42,18 +118,21 @@ class TechnicalIndicators:
             period = self.indicator_config.get('rsi_period', 14)
         
         df = df.copy()
-        
-        # Calculate price changes
-        delta = df[column].diff()
-        
-        # Separate gains and losses
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        # Calculate RS and RSI
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
+
+        if NUMBA_AVAILABLE:
+            df['rsi'] = _rsi_kernel(df[column].to_numpy(dtype=np.float64), period)
+        else:
+            # Calculate price changes
+            delta = df[column].diff()
+
+            # Separate gains and losses
+            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+
+            # Calculate RS and RSI
+            rs = gain / loss
+            df['rsi'] = 100 - (100 / (1 + rs))
+
         logger.debug(f"Calculated RSI with period {period}")
         return df
     
@@ -86,17 +165,23 @@ class TechnicalIndicators:
             signal = self.indicator_config.get('macd_signal', 9)
         
         df = df.copy()
-        
-        # Calculate EMAs
-        ema_fast = df[column].ewm(span=fast, adjust=False).mean()
-        ema_slow = df[column].ewm(span=slow, adjust=False).mean()
-        
-        # Calculate MACD line
-        df['macd'] = ema_fast - ema_slow
-        
-        # Calculate signal line
-        df['macd_signal'] = df['macd'].ewm(span=signal, adjust=False).mean()
-        
+
+        if NUMBA_AVAILABLE:
+            close = df[column].to_numpy(dtype=np.float64)
+            macd_line = _ema_kernel(close, fast) - _ema_kernel(close, slow)
+            df['macd'] = macd_line
+            df['macd_signal'] = _ema_kernel(macd_line, signal)
+        else:
+            # Calculate EMAs
+            ema_fast = df[column].ewm(span=fast, adjust=False).mean()
+            ema_slow = df[column].ewm(span=slow, adjust=False).mean()
+
+            # Calculate MACD line
+            df['macd'] = ema_fast - ema_slow
+
+            # Calculate signal line
+            df['macd_signal'] = df['macd'].ewm(span=signal, adjust=False).mean()
+
         # Calculate histogram
         df['macd_histogram'] = df['macd'] - df['macd_signal']
         
@@ -134,8 +219,13 @@ class TechnicalIndicators:
         df[f'sma_{long}'] = df[column].rolling(window=long).mean()
         
         # Exponential Moving Averages
-        df[f'ema_{short}'] = df[column].ewm(span=short, adjust=False).mean()
-        df[f'ema_{long}'] = df[column].ewm(span=long, adjust=False).mean()
+        if NUMBA_AVAILABLE:
+            close = df[column].to_numpy(dtype=np.float64)
+            df[f'ema_{short}'] = _ema_kernel(close, short)
+            df[f'ema_{long}'] = _ema_kernel(close, long)
+        else:
+            df[f'ema_{short}'] = df[column].ewm(span=short, adjust=False).mean()
+            df[f'ema_{long}'] = df[column].ewm(span=long, adjust=False).mean()
         
         logger.debug(f"Calculated moving averages ({short}/{long})")
         return df
@@ -273,6 +363,59 @@ class TechnicalIndicators:
         df = self.calculate_atr(df)
         df = self.calculate_vwap(df)
         df = self.calculate_volume_sma(df, period=20)  # Add 20-period average volume
-        
+
+        # Keep indicator columns at float32 alongside the downcast OHLCV
+        # data (pandas promotes rolling/ewm outputs back to float64)
+        float64_cols = df.select_dtypes('float64').columns
+        if len(float64_cols) > 0:
+            df[float64_cols] = df[float64_cols].astype('float32')
+
         logger.info("All indicators calculated successfully")
         return df
+
+    def calculate_incremental(
+        self,
+        prev_df: pd.DataFrame,
+        new_bars: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Append new bars to an already-indicated DataFrame incrementally
+
+        Instead of recomputing every indicator over the full history, only
+        the last INCREMENTAL_LOOKBACK bars plus the new ones are recomputed
+        and the fresh rows are appended. VWAP (a session-cumulative value)
+        is spliced from the previous frame's running totals so the result
+        matches a full recompute.
+
+        Args:
+            prev_df: Previous DataFrame with indicators already calculated
+            new_bars: New OHLCV bars not present in prev_df
+
+        Returns:
+            DataFrame covering prev_df plus new_bars, with all indicators
+        """
+        if prev_df is None or prev_df.empty:
+            return self.calculate_all_indicators(new_bars)
+
+        if new_bars.empty:
+            return prev_df
+
+        base_columns = [c for c in prev_df.columns if c in new_bars.columns]
+        tail = prev_df[base_columns].tail(self.INCREMENTAL_LOOKBACK)
+        combined = pd.concat([tail, new_bars[base_columns]])
+
+        recomputed = self.calculate_all_indicators(combined)
+        new_rows = recomputed.iloc[len(tail):].copy()
+
+        # VWAP accumulates over the whole session, so continue the running
+        # price*volume and volume totals instead of restarting at the tail
+        prev_cum_vol = float(prev_df['volume'].sum())
+        prev_cum_pv = float(prev_df['vwap'].iloc[-1]) * prev_cum_vol
+
+        typical_price = (new_rows['high'] + new_rows['low'] + new_rows['close']) / 3
+        cum_pv = prev_cum_pv + (typical_price * new_rows['volume']).cumsum()
+        cum_vol = prev_cum_vol + new_rows['volume'].cumsum()
+        new_rows['vwap'] = cum_pv / cum_vol
+
+        logger.debug(f"Incrementally updated indicators for {len(new_rows)} new bars")
+        return pd.concat([prev_df, new_rows])
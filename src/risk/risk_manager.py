@@ -3,6 +3,7 @@ Risk Manager
 Manages position sizing, stop losses, and portfolio risk
 """
 
+import time
 from typing import Dict, Optional
 from dataclasses import dataclass
 
@@ -44,7 +45,12 @@ class Position:
 
 class RiskManager:
     """Manage trading risk and position sizing"""
-    
+
+    # How long a computed portfolio summary stays valid. Direct price
+    # updates on Position objects bypass the dirty flag, so the TTL also
+    # bounds how stale a mark-to-market figure can get in tick-driven mode.
+    SUMMARY_TTL_SECONDS = 0.5
+
     def __init__(self):
         """Initialize risk manager"""
         self.risk_config = config.get_risk_config()
@@ -52,7 +58,11 @@ class RiskManager:
         self.initial_capital = self.portfolio_value
         self.positions: Dict[str, Position] = {}
         self.daily_pnl = 0.0
-        
+
+        # Memoized portfolio summary (invalidated on position mutations)
+        self._summary_cache: Optional[Dict] = None
+        self._summary_ts = 0.0
+
         logger.info(f"Initialized RiskManager with capital: Rs.{self.portfolio_value:,.2f}")
     
     def calculate_position_size(
@@ -167,7 +177,8 @@ class RiskManager:
         
         self.positions[symbol] = position
         self.portfolio_value -= (quantity * entry_price)
-        
+        self._invalidate_summary()
+
         logger.info(f"Added position: {symbol} x{quantity} @ ${entry_price:.2f}")
         logger.info(f"Remaining capital: ${self.portfolio_value:.2f}")
     
@@ -198,7 +209,8 @@ class RiskManager:
         
         # Remove position
         del self.positions[symbol]
-        
+        self._invalidate_summary()
+
         logger.info(
             f"Closed position: {symbol} x{position.quantity} @ ${exit_price:.2f} "
             f"| P&L: ${position.unrealized_pnl:.2f} ({position.unrealized_pnl_percent*100:.2f}%)"
@@ -216,6 +228,7 @@ class RiskManager:
         for symbol, price in prices.items():
             if symbol in self.positions:
                 self.positions[symbol].update_price(price)
+        self._invalidate_summary()
     
     def check_stop_loss(self, symbol: str) -> bool:
         """
@@ -265,13 +278,28 @@ class RiskManager:
         
         return False
     
+    def _invalidate_summary(self):
+        """Drop the memoized portfolio summary after a position mutation"""
+        self._summary_cache = None
+
     def get_portfolio_summary(self) -> Dict:
         """
         Get portfolio summary
-        
+
+        The aggregate is memoized for SUMMARY_TTL_SECONDS and invalidated
+        when positions change, so logging it repeatedly (every cycle, or
+        every tick in websocket mode) doesn't re-mark the book each time.
+
         Returns:
             Dictionary with portfolio metrics
         """
+        now = time.monotonic()
+        if (
+            self._summary_cache is not None
+            and now - self._summary_ts < self.SUMMARY_TTL_SECONDS
+        ):
+            return self._summary_cache
+
         total_unrealized_pnl = sum(
             pos.unrealized_pnl for pos in self.positions.values()
         )
@@ -283,7 +311,7 @@ class RiskManager:
         total_value = self.portfolio_value + total_market_value
         total_return = (total_value - self.initial_capital) / self.initial_capital
         
-        return {
+        summary = {
             'cash': self.portfolio_value,
             'positions_value': total_market_value,
             'total_value': total_value,
@@ -302,8 +330,13 @@ class RiskManager:
                 for symbol, pos in self.positions.items()
             }
         }
-    
+
+        self._summary_cache = summary
+        self._summary_ts = now
+        return summary
+
     def reset_daily_pnl(self):
         """Reset daily P&L counter (call at start of each trading day)"""
         self.daily_pnl = 0.0
+        self._invalidate_summary()
         logger.info("Daily P&L reset")
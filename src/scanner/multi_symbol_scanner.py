@@ -7,55 +7,32 @@ import time
 import pandas as pd
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from dataclasses import dataclass
 
 from src.data.data_fetcher import DataFetcher
 from src.data.data_processor import DataProcessor
 from src.strategies.intraday_strategy import IntradayStrategy
 from src.strategies.base_strategy import Signal
+from src.utils.creds import try_get_creds
+from src.utils.instruments import load_instrument_tokens
 from src.utils.logger import get_logger
+from src.utils.market_hours import next_market_open
 from src.utils.config import config
 
 logger = get_logger('multi_symbol_scanner', config.get('logging'))
 
 
-class RateLimiter:
-    """Rate limiter for API calls - respects Zerodha's 3 requests/second limit"""
-    
-    def __init__(self, max_calls: int = 3, time_window: float = 1.0):
-        """
-        Initialize rate limiter
-        
-        Args:
-            max_calls: Maximum number of calls allowed in time window
-            time_window: Time window in seconds
-        """
-        self.max_calls = max_calls
-        self.time_window = time_window
-        self.calls = []
-        self.lock = threading.Lock()
-    
-    def wait_if_needed(self):
-        """Wait if rate limit would be exceeded"""
-        with self.lock:
-            now = time.time()
-            
-            # Remove calls outside the time window
-            self.calls = [call_time for call_time in self.calls if now - call_time < self.time_window]
-            
-            # If at limit, wait until oldest call expires
-            if len(self.calls) >= self.max_calls:
-                sleep_time = self.time_window - (now - self.calls[0]) + 0.1  # Add 100ms buffer
-                if sleep_time > 0:
-                    logger.debug(f"Rate limit reached, waiting {sleep_time:.2f}s")
-                    time.sleep(sleep_time)
-                    # Remove expired calls after waiting
-                    now = time.time()
-                    self.calls = [call_time for call_time in self.calls if now - call_time < self.time_window]
-            
-            # Record this call
-            self.calls.append(time.time())
+@dataclass(slots=True)
+class ScannerStats:
+    """Scanner performance counters
+
+    Slot attributes keep per-signal increments cheap (attribute store,
+    no dict hashing); get_statistics assembles the reporting dict.
+    """
+    symbols_scanned: int = 0
+    signals_generated: int = 0
 
 
 class MultiSymbolScanner:
@@ -74,37 +51,58 @@ class MultiSymbolScanner:
         self.data_processor = DataProcessor()
         self.strategy = IntradayStrategy()
         self.alert_manager = alert_manager
-        
-        # Rate limiter for Zerodha API (3 requests per second)
-        self.rate_limiter = RateLimiter(max_calls=3, time_window=1.0)
-        
-        # Scanner state
+
+        # Scanner state - signal history is a bounded ring buffer so a
+        # 24x7 run cannot grow the heap without limit
         self.is_running = False
-        self.signals: List[Signal] = []
+        self.signals: deque = deque(maxlen=1000)
         self.last_scan_time: Dict[str, datetime] = {}
         self.scan_interval = 60  # Scan every 60 seconds
+
+        # WebSocket streaming state (push-driven scanning)
+        self.stream = None
+        self._bar_buckets: Dict[str, datetime] = {}
+        self.bar_interval_minutes = 5
+
+        # Per-symbol scan results keyed by the bar they were computed in:
+        # polling faster than the bar interval reuses the cached signals
+        # instead of re-fetching and re-running the indicator math
+        self._scan_cache: Dict[str, tuple] = {}
         
         # Performance tracking
-        self.symbols_scanned = 0
-        self.signals_generated = 0
+        self.stats = ScannerStats()
         
         logger.info(f"Initialized MultiSymbolScanner with {len(self.symbols)} symbols")
-        logger.info("Rate limiter: 3 requests/second (Zerodha API limit)")
     
+    def _current_bar_start(self) -> datetime:
+        """Start of the bar interval the current time falls into"""
+        now = datetime.now()
+        return now.replace(
+            minute=(now.minute // self.bar_interval_minutes) * self.bar_interval_minutes,
+            second=0,
+            microsecond=0
+        )
+
     def scan_single_symbol(self, symbol: str) -> List[Signal]:
         """
         Scan a single symbol for signals
-        
+
+        Results are cached per bar: re-scanning within the same 5-minute
+        bar returns the previous answer without touching the network or
+        recomputing indicators, since no new bar can have closed yet.
+
         Args:
             symbol: Stock symbol to scan
-            
+
         Returns:
             List of signals found
         """
+        bar_ts = self._current_bar_start()
+        cached = self._scan_cache.get(symbol)
+        if cached is not None and cached[0] == bar_ts:
+            return cached[1]
+
         try:
-            # Wait if needed to respect rate limits
-            self.rate_limiter.wait_if_needed()
-            
             # Fetch recent data (last 5 days)
             df = self.data_fetcher.get_historical_data(
                 symbol=symbol,
@@ -122,12 +120,13 @@ class MultiSymbolScanner:
             
             # Generate signals
             signals = self.strategy.generate_signals(df, symbol)
-            
-            # Update scan time
+
+            # Update scan time and cache the result for this bar
             self.last_scan_time[symbol] = datetime.now()
-            
+            self._scan_cache[symbol] = (bar_ts, signals)
+
             return signals
-            
+
         except Exception as e:
             logger.error(f"Error scanning {symbol}: {e}")
             return []
@@ -144,9 +143,10 @@ class MultiSymbolScanner:
         
         logger.info(f"Starting scan of {len(self.symbols)} symbols...")
         
-        # Use ThreadPoolExecutor for parallel scanning
-        # Reduced to 2 workers to respect Zerodha rate limits (3 req/sec)
-        with ThreadPoolExecutor(max_workers=2) as executor:
+        # Scanning is I/O-bound (one HTTPS round trip per symbol), so use
+        # enough workers to overlap the network waits; DataFetcher's token
+        # buckets already pace the outbound request rate at the API limit
+        with ThreadPoolExecutor(max_workers=8) as executor:
             # Submit all scan tasks
             future_to_symbol = {
                 executor.submit(self.scan_single_symbol, symbol): symbol
@@ -162,43 +162,151 @@ class MultiSymbolScanner:
                         all_signals.extend(signals)
                         logger.info(f"✅ {symbol}: Found {len(signals)} signal(s)")
                     
-                    self.symbols_scanned += 1
+                    self.stats.symbols_scanned += 1
                     
                 except Exception as e:
                     logger.error(f"❌ {symbol} failed: {e}")
         
         elapsed = time.time() - start_time
-        self.signals_generated += len(all_signals)
+        self.stats.signals_generated += len(all_signals)
         
         logger.info(f"Scan complete: {len(all_signals)} signals in {elapsed:.1f}s")
         
-        # Send alerts if signals found and alert manager is configured
+        # Queue alerts for background dispatch so the scan returns without
+        # waiting on notification/sound I/O
         if all_signals and self.alert_manager:
-            if len(all_signals) == 1:
-                self.alert_manager.send_signal_alert(all_signals[0])
-            else:
-                self.alert_manager.send_multiple_signals_alert(all_signals)
+            self.alert_manager.queue_signals(all_signals)
         
         return all_signals
     
+    def start_streaming_scan(self, callback=None) -> bool:
+        """
+        Drive scans from KiteTicker websocket ticks instead of polling
+
+        Each tick is bucketed into its 5-minute bar; a symbol is only
+        re-scanned when one of its bars actually closes, so there is no
+        fixed-interval polling of all symbols.
+
+        Args:
+            callback: Optional callback function called with signals
+
+        Returns:
+            True if the websocket stream started, False if unavailable
+        """
+        creds = try_get_creds()
+
+        if creds is None:
+            logger.warning("Zerodha credentials missing, cannot start websocket scan")
+            return False
+
+        tokens_data = load_instrument_tokens()
+        if tokens_data is None:
+            logger.warning("instrument_tokens.json not found, cannot start websocket scan")
+            return False
+
+        try:
+            from src.data.realtime_stream import RealtimeDataStream
+
+            tokens = {sym: tok for sym, tok in tokens_data.items() if sym in self.symbols}
+            if not tokens:
+                logger.warning("No instrument tokens for scanner symbols")
+                return False
+
+            def on_tick(symbol, tick):
+                self._on_bar_tick(symbol, callback)
+
+            self.stream = RealtimeDataStream(api_key=creds.api_key, access_token=creds.access_token)
+            self.stream.register_tick_callback(on_tick)
+            self.stream.subscribe(list(tokens.keys()), tokens)
+            self.stream.start()
+
+            logger.info(f"🔴 Streaming scan started for {len(tokens)} symbols")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to start websocket scan: {e}")
+            self.stream = None
+            return False
+
+    def _on_bar_tick(self, symbol: str, callback=None):
+        """Re-scan a symbol when a tick crosses its 5-minute bar boundary"""
+        now = datetime.now()
+        bucket = now.replace(
+            minute=(now.minute // self.bar_interval_minutes) * self.bar_interval_minutes,
+            second=0,
+            microsecond=0
+        )
+
+        previous_bucket = self._bar_buckets.get(symbol)
+        self._bar_buckets[symbol] = bucket
+
+        # Only scan when a bar has just closed for this symbol
+        if previous_bucket is None or previous_bucket == bucket:
+            return
+
+        signals = self.scan_single_symbol(symbol)
+        if signals:
+            self.signals.extend(signals)
+            self.stats.signals_generated += len(signals)
+
+            if self.alert_manager:
+                self.alert_manager.queue_signals(signals)
+
+            if callback:
+                callback(signals)
+
+        self.stats.symbols_scanned += 1
+
     def start_continuous_scan(self, callback=None):
         """
         Start continuous scanning
-        
+
+        Uses the KiteTicker websocket when credentials and instrument
+        tokens are available (scans fire on bar close, not on a timer)
+        and falls back to the REST polling loop otherwise.
+
         Args:
             callback: Optional callback function called with signals: callback(signals)
         """
         self.is_running = True
         logger.info("🔍 Starting continuous scanner...")
-        
+
+        # Prefer push-driven scanning over the polling loop
+        if self.start_streaming_scan(callback):
+            try:
+                while self.is_running:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                logger.info("Scanner stopped by user")
+                self.is_running = False
+            finally:
+                if self.stream:
+                    self.stream.stop()
+            return
+
+        logger.info("Falling back to REST polling scan")
+
         while self.is_running:
             try:
-                # Check if market is open
+                # Check if market is open - sleep through the whole closed
+                # window instead of waking every 5 minutes to re-check
                 if not self._is_market_hours():
-                    logger.info("Market closed. Waiting...")
-                    time.sleep(300)  # Check every 5 minutes
+                    next_open = next_market_open()
+                    wait_seconds = max(
+                        30.0,
+                        (next_open - datetime.now(next_open.tzinfo)).total_seconds()
+                    )
+                    logger.info(
+                        "Market closed. Sleeping until %s",
+                        next_open.strftime('%Y-%m-%d %H:%M IST')
+                    )
+                    # Sleep in one-minute slices so stop() still takes
+                    # effect promptly overnight
+                    deadline = time.monotonic() + wait_seconds
+                    while self.is_running and time.monotonic() < deadline:
+                        time.sleep(max(0.0, min(60.0, deadline - time.monotonic())))
                     continue
-                
+
                 # Scan all symbols
                 signals = self.scan_all_symbols()
                 
@@ -231,6 +339,8 @@ class MultiSymbolScanner:
     def stop(self):
         """Stop the scanner"""
         self.is_running = False
+        if self.stream:
+            self.stream.stop()
         logger.info("Scanner stopped")
     
     def _is_market_hours(self) -> bool:
@@ -279,8 +389,8 @@ class MultiSymbolScanner:
         return {
             'is_running': self.is_running,
             'symbols_count': len(self.symbols),
-            'symbols_scanned': self.symbols_scanned,
-            'signals_generated': self.signals_generated,
+            'symbols_scanned': self.stats.symbols_scanned,
+            'signals_generated': self.stats.signals_generated,
             'signals_in_memory': len(self.signals),
             'last_scan_times': self.last_scan_time
         }
@@ -294,12 +404,12 @@ class MultiSymbolScanner:
         """
         cutoff_time = datetime.now() - timedelta(hours=hours)
         original_count = len(self.signals)
-        
-        self.signals = [
-            signal for signal in self.signals
-            if signal.timestamp >= cutoff_time
-        ]
-        
+
+        self.signals = deque(
+            (signal for signal in self.signals if signal.timestamp >= cutoff_time),
+            maxlen=self.signals.maxlen
+        )
+
         removed = original_count - len(self.signals)
         if removed > 0:
             logger.info(f"Cleared {removed} old signals")
@@ -23,7 +23,15 @@ class SignalType(Enum):
 
 class Signal:
     """Trading signal with detailed reasoning"""
-    
+
+    # Signals are created per qualifying bar across 50 symbols, so skip
+    # the per-instance __dict__ to keep them small and attribute access fast
+    __slots__ = (
+        'symbol', 'signal_type', 'price', 'strength', 'reason',
+        'timestamp', 'stop_loss', 'take_profit', 'indicators',
+        'conditions_met'
+    )
+
     def __init__(
         self,
         symbol: str,
@@ -3,6 +3,7 @@ Intraday Trading Strategy - Ultra Simple Trend Following
 Trade only with the trend using 15m EMA, buy dips/sell spikes on 5m timeframe
 """
 
+import numpy as np
 import pandas as pd
 from typing import List, Tuple
 
@@ -58,17 +59,22 @@ class IntradayStrategy(BaseStrategy):
         
         # Calculate all indicators
         df = self.indicators.calculate_all_indicators(df)
-        
+
         signals = []
-        
+
+        # Vectorized pre-filter: evaluate the mandatory filters on full NumPy
+        # arrays at once, then only build Signal objects (and reason strings)
+        # for the bars that survive. Bars that fail a must-have never touch
+        # the slow per-row path.
+        candidate_mask = self._candidate_mask(df)
+
         # Iterate through recent data to find signals
         for i in range(len(df) - 1, max(len(df) - 10, 0), -1):
-            row = df.iloc[i]
-            
-            # Check if we have valid indicator values
-            if pd.isna(row.get('rsi')) or pd.isna(row.get('macd')):
+            if not candidate_mask[i]:
                 continue
-            
+
+            row = df.iloc[i]
+
             # Check entry conditions
             should_buy, buy_reason = self.get_entry_conditions(row)
             
@@ -219,7 +225,47 @@ class IntradayStrategy(BaseStrategy):
                 logger.info(f"Generated SELL signal for {symbol}: {sell_reason}")
         
         return signals
-    
+
+    def _candidate_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the mandatory filters for every bar in one vectorized pass
+
+        Each must-have filter becomes a single comparison on contiguous
+        float64 arrays; the final mask is the AND-reduction of all layers.
+        Only bars where this mask is True need the per-row scoring path.
+
+        Args:
+            df: DataFrame with price data and indicators
+
+        Returns:
+            Boolean array, True where a bar passes all mandatory filters
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        rsi = df['rsi'].to_numpy(dtype=np.float64)
+        macd = df['macd'].to_numpy(dtype=np.float64)
+        ema_50 = df['ema_50'].to_numpy(dtype=np.float64)
+        volume_avg = df['volume_avg'].to_numpy(dtype=np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(volume_avg > 0, volume / volume_avg, 0.0)
+            candle_range = np.where(close > 0, (high - low) / close, 0.0)
+
+        return np.logical_and.reduce([
+            # Valid indicator values (warm-up bars have NaNs)
+            ~np.isnan(rsi),
+            ~np.isnan(macd),
+            ~np.isnan(ema_50),
+            # MUST-HAVE #1: Trend bias (price above or below EMA50)
+            close != ema_50,
+            # MUST-HAVE #2: Volume
+            volume_ratio >= self.min_volume_multiplier,
+            # MUST-HAVE #3: Candle range
+            candle_range >= self.min_candle_range,
+        ])
+
     def get_entry_conditions(self, row: pd.Series) -> Tuple[bool, str]:
         """
         Simple 3+5 Scoring System
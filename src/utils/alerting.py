@@ -4,6 +4,8 @@ Provides multiple alert mechanisms: desktop notifications, sound, email, Telegra
 """
 
 import logging
+import queue
+import threading
 from typing import List, Optional
 from datetime import datetime
 import os
@@ -70,9 +72,16 @@ class AlertManager:
         self.telegram_bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
         
+        # Background alert dispatch: queue_signals enqueues and returns
+        # immediately; a daemon thread (started on first use) does the
+        # notification/sound/email I/O off the caller's thread
+        self._alert_queue: queue.Queue = queue.Queue()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._dispatcher_lock = threading.Lock()
+
         # Check capabilities
         self._check_capabilities()
-        
+
     def _check_capabilities(self):
         """Check which alert mechanisms are available"""
         if self.desktop_enabled and not DESKTOP_ALERTS_AVAILABLE:
@@ -97,6 +106,48 @@ class AlertManager:
             logger.warning("Telegram alerts enabled but credentials not configured in .env")
             self.telegram_enabled = False
     
+    def queue_signals(self, signals: List):
+        """
+        Queue signals for background alert dispatch
+
+        Hands the list to a daemon worker and returns immediately, so the
+        scanning/UI thread never waits on notification or sound playback.
+
+        Args:
+            signals: List of Signal objects (single or multiple)
+        """
+        if not signals:
+            return
+        self._ensure_dispatcher()
+        self._alert_queue.put(list(signals))
+
+    def _ensure_dispatcher(self):
+        """Start the alert dispatch thread if it is not already running"""
+        if self._dispatcher is not None and self._dispatcher.is_alive():
+            return
+        with self._dispatcher_lock:
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._dispatcher = threading.Thread(
+                    target=self._drain_alerts,
+                    name='alert-dispatcher',
+                    daemon=True
+                )
+                self._dispatcher.start()
+
+    def _drain_alerts(self):
+        """Dispatch queued signal batches until the process exits"""
+        while True:
+            signals = self._alert_queue.get()
+            try:
+                if len(signals) == 1:
+                    self.send_signal_alert(signals[0])
+                else:
+                    self.send_multiple_signals_alert(signals)
+            except Exception as e:
+                logger.error(f"Alert dispatch failed: {e}")
+            finally:
+                self._alert_queue.task_done()
+
     def send_signal_alert(self, signal):
         """
         Send alerts for a new trading signal
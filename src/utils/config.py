@@ -3,6 +3,7 @@ Configuration Manager
 Loads and manages application configuration from YAML file
 """
 
+import functools
 import yaml
 import os
 from pathlib import Path
@@ -51,52 +52,76 @@ class Config:
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get configuration value using dot notation
-        
+
         Args:
             key: Configuration key (e.g., 'trading.mode')
             default: Default value if key not found
-            
+
         Returns:
             Configuration value
         """
+        value = self._resolve(key)
+        return default if value is None else value
+
+    @functools.lru_cache(maxsize=None)
+    def _resolve(self, key: str) -> Any:
+        """Resolve a dot-notation key (memoized; cleared by reload())"""
         keys = key.split('.')
         value = self.config
-        
+
         for k in keys:
             if isinstance(value, dict):
                 value = value.get(k)
                 if value is None:
-                    return default
+                    return None
             else:
-                return default
-        
+                return None
+
         return value
-    
+
+    @functools.lru_cache(maxsize=None)
     def get_trading_config(self) -> Dict[str, Any]:
         """Get trading configuration"""
         return self.config.get('trading', {})
-    
+
+    @functools.lru_cache(maxsize=None)
     def get_data_config(self) -> Dict[str, Any]:
         """Get data configuration"""
         return self.config.get('data', {})
-    
+
+    @functools.lru_cache(maxsize=None)
     def get_strategy_config(self) -> Dict[str, Any]:
         """Get strategy configuration"""
         return self.config.get('strategy', {})
-    
+
+    @functools.lru_cache(maxsize=None)
     def get_risk_config(self) -> Dict[str, Any]:
         """Get risk management configuration"""
         return self.config.get('risk', {})
-    
+
+    @functools.lru_cache(maxsize=None)
     def get_api_config(self) -> Dict[str, Any]:
         """Get API configuration"""
         return self.config.get('api', {})
-    
+
+    @functools.lru_cache(maxsize=None)
     def get_symbols(self) -> list:
         """Get list of trading symbols"""
         trading_config = self.get_trading_config()
         return trading_config.get('symbols', [])
 
+    def reload(self):
+        """Re-read the YAML file and clear all memoized accessors"""
+        self.config = self._load_config()
+        self._replace_env_vars()
+        self._resolve.cache_clear()
+        self.get_trading_config.cache_clear()
+        self.get_data_config.cache_clear()
+        self.get_strategy_config.cache_clear()
+        self.get_risk_config.cache_clear()
+        self.get_api_config.cache_clear()
+        self.get_symbols.cache_clear()
+
 
 # Global configuration instance
 config = Config()
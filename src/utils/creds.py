@@ -0,0 +1,62 @@
+"""
+Credential utilities
+Loads Zerodha API credentials from the environment exactly once
+"""
+
+import functools
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True, slots=True)
+class ZerodhaCreds:
+    """Immutable bundle of Zerodha API credentials"""
+    api_key: str
+    access_token: str
+    api_secret: Optional[str] = None
+
+
+@functools.cache
+def try_get_creds() -> Optional[ZerodhaCreds]:
+    """
+    Load Zerodha credentials, returning None if they are not configured
+
+    The .env file is parsed once per process; every later call is a
+    cached lookup. Use this where a mock/paper fallback exists.
+
+    Returns:
+        ZerodhaCreds if api key and access token are set, else None
+    """
+    load_dotenv()
+
+    api_key = os.getenv('ZERODHA_API_KEY')
+    api_secret = os.getenv('ZERODHA_API_SECRET')
+    access_token = os.getenv('ZERODHA_ACCESS_TOKEN')
+
+    if not api_key or not access_token:
+        return None
+
+    return ZerodhaCreds(api_key, access_token, api_secret)
+
+
+def get_creds() -> ZerodhaCreds:
+    """
+    Load Zerodha credentials, raising if any of them is missing
+
+    Use this where live trading is required and there is no fallback.
+
+    Returns:
+        ZerodhaCreds with all three values set
+
+    Raises:
+        ValueError: If any credential is missing from the environment
+    """
+    creds = try_get_creds()
+
+    if creds is None or not creds.api_secret:
+        raise ValueError("Missing Zerodha credentials in .env file")
+
+    return creds
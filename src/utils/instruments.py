@@ -0,0 +1,47 @@
+"""
+Instrument token loading
+Shared loader for the symbol→token map produced by get_instruments.py
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# get_instruments.py writes both files; the MessagePack mirror decodes
+# a few times faster than JSON, so readers prefer it when present
+TOKENS_JSON = Path('instrument_tokens.json')
+TOKENS_MSGPACK = Path('instrument_tokens.msgpack')
+
+
+def tokens_available() -> bool:
+    """Check whether an instrument token map exists on disk"""
+    return TOKENS_JSON.exists() or (MSGPACK_AVAILABLE and TOKENS_MSGPACK.exists())
+
+
+def load_instrument_tokens() -> Optional[Dict[str, int]]:
+    """
+    Load the symbol→token map, preferring MessagePack over JSON
+
+    Returns:
+        Dict mapping 'SYMBOL.NS' to its instrument token, or None when
+        no token file exists (run get_instruments.py to create one)
+    """
+    if MSGPACK_AVAILABLE and TOKENS_MSGPACK.exists():
+        try:
+            with open(TOKENS_MSGPACK, 'rb') as f:
+                return msgpack.unpack(f)
+        except Exception:
+            # Stale or truncated mirror - fall through to the JSON source
+            pass
+
+    if TOKENS_JSON.exists():
+        with open(TOKENS_JSON, 'r') as f:
+            return json.load(f)
+
+    return None
@@ -47,25 +47,29 @@ class Logger:
             file_handler.setFormatter(formatter)
             self.logger.addHandler(file_handler)
     
-    def debug(self, message: str):
-        """Log debug message"""
-        self.logger.debug(message)
-    
-    def info(self, message: str):
-        """Log info message"""
-        self.logger.info(message)
-    
-    def warning(self, message: str):
-        """Log warning message"""
-        self.logger.warning(message)
-    
-    def error(self, message: str, exc_info: bool = False):
-        """Log error message"""
-        self.logger.error(message, exc_info=exc_info)
-    
-    def critical(self, message: str, exc_info: bool = False):
-        """Log critical message"""
-        self.logger.critical(message, exc_info=exc_info)
+    def debug(self, message: str, *args):
+        """Log debug message (lazy %-style args supported)"""
+        self.logger.debug(message, *args)
+
+    def info(self, message: str, *args):
+        """Log info message (lazy %-style args supported)"""
+        self.logger.info(message, *args)
+
+    def warning(self, message: str, *args):
+        """Log warning message (lazy %-style args supported)"""
+        self.logger.warning(message, *args)
+
+    def error(self, message: str, *args, exc_info: bool = False):
+        """Log error message (lazy %-style args supported)"""
+        self.logger.error(message, *args, exc_info=exc_info)
+
+    def critical(self, message: str, *args, exc_info: bool = False):
+        """Log critical message (lazy %-style args supported)"""
+        self.logger.critical(message, *args, exc_info=exc_info)
+
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether this logger would emit at the given level"""
+        return self.logger.isEnabledFor(level)
 
 
 def get_logger(name: str, config: Optional[dict] = None) -> Logger:
@@ -3,7 +3,7 @@ Market Hours Validation Utility
 Checks if NSE market is currently open for trading
 """
 
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 import pytz
 
 
@@ -42,6 +42,30 @@ def check_market_hours():
     return True, f"✅ MARKET OPEN - Trading active (Current: {now.strftime('%I:%M %p IST')})"
 
 
+def next_market_open():
+    """
+    Get the next NSE market open time
+
+    Returns:
+        datetime: Timezone-aware IST datetime of the next 9:15 AM session
+        open (today's if the market has not opened yet, otherwise the
+        next weekday's)
+    """
+    ist = pytz.timezone('Asia/Kolkata')
+    now = datetime.now(ist)
+    open_today = now.replace(hour=9, minute=15, second=0, microsecond=0)
+
+    if now.weekday() < 5 and now.time() < time(9, 15):
+        return open_today
+
+    # Roll forward to the next weekday's open
+    candidate = open_today + timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+
+    return candidate
+
+
 def get_market_status_detailed():
     """
     Get detailed market status information